@@ -3,11 +3,17 @@ Authentication endpoints.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import Optional
+import hmac
+import math
+import time
+import uuid
 import jwt
+from cachetools import TTLCache
 
 from models.database import get_db
 from models.schemas import UserCreate, UserResponse, Token
@@ -16,6 +22,9 @@ from core.config import settings
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Decoded payloads keyed by raw bearer token, so repeat requests skip HMAC verification
+_token_cache = TTLCache(maxsize=4096, ttl=60)
+
 # Mock user data for demo purposes
 MOCK_USERS = {
     "admin@retail.com": {
@@ -39,11 +48,31 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+async def decode_token(token: str) -> dict:
+    """Decode a JWT, reusing the cached payload while the token is unexpired."""
+    payload = _token_cache.get(token)
+    if payload is not None and payload.get("exp", math.inf) > time.time():
+        return payload
+    
+    try:
+        # Signature verification is CPU-bound; keep it off the event loop
+        payload = await run_in_threadpool(
+            jwt.decode, token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except jwt.PyJWTError:
+        # Never let a rejected token linger in the cache
+        _token_cache.pop(token, None)
+        raise
+    
+    _token_cache[token] = payload
+    return payload
+
 @router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """User login endpoint."""
     # For demo purposes, accept any email with password "password123"
-    if form_data.password == "password123":
+    # (compare in constant time so the check doesn't leak timing information)
+    if hmac.compare_digest(form_data.password.encode(), b"password123"):
         user_data = MOCK_USERS.get(form_data.username, {
             "id": "1",
             "email": form_data.username,
@@ -53,8 +82,10 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         })
         
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user_data["email"]}, expires_delta=access_token_expires
+        access_token = await run_in_threadpool(
+            create_access_token,
+            data={"sub": user_data["email"]},
+            expires_delta=access_token_expires
         )
         
         return {
@@ -75,7 +106,7 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     # This would create a new user in production
     # For demo purposes, just return the user data
     return UserResponse(
-        id="new_user_id",
+        id=uuid.uuid4().hex,
         email=user.email,
         username=user.username,
         full_name=user.full_name,
@@ -89,7 +120,7 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
 async def read_users_me(token: str = Depends(oauth2_scheme)):
     """Get current user information."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = await decode_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise HTTPException(status_code=401, detail="Invalid token")
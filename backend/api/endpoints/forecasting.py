@@ -2,33 +2,88 @@
 Forecasting endpoints using Prophet-based probabilistic forecasting.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict, Any
-import pandas as pd
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+import numpy as np
 from datetime import datetime, timedelta
 import logging
+import uuid
+from cachetools import TTLCache
 
-from models.database import get_db
-from models.schemas import ForecastRequest, ForecastResponse
-from core.forecasting.models import ProphetForecaster, EnsembleForecaster
+from core import cache
+from models.database import get_db, get_ro_db
+from models.queries import forecasts_adapter, list_forecasts
+from models.schemas import (
+    EntityId, ForecastRequest, ForecastResponse, SalesRecord, ForecastTrainRequest,
+    ForecastUpdateRequest, ForecastGenerateRequest, EnsembleForecastRequest
+)
+from core.forecasting.keys import format_model_key
+from core.forecasting.registry import get_forecaster, get_ensemble_forecaster, run_forecast_task
+
+if TYPE_CHECKING:
+    from core.forecasting.models import SalesData
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Initialize forecaster instances
-prophet_forecaster = ProphetForecaster()
-ensemble_forecaster = EnsembleForecaster()
+# Below this many rows, sales payloads are handed to the forecaster as NumPy
+# arrays; DataFrame construction overhead dominates for small webhook batches
+SMALL_PAYLOAD_ROWS = 64
+
+# Status of background training jobs, keyed by job id
+_training_jobs = TTLCache(maxsize=1024, ttl=3600)
+
 
+def _parse_sales_data(sales_data: List[SalesRecord]) -> "SalesData":
+    """Convert request sales records into the forecaster's input format."""
+    # Records arrive as validated dates, so convert them straight to datetime64
+    # rather than round-tripping through pd.to_datetime's generic parser
+    dates = np.array([record.date for record in sales_data], dtype="datetime64[D]").astype("datetime64[ns]")
+    quantities = np.fromiter(
+        (record.quantity_sold for record in sales_data), dtype=np.float64, count=len(sales_data)
+    )
+    
+    if len(sales_data) < SMALL_PAYLOAD_ROWS:
+        return dates, quantities
+    
+    # Imported here so workers that never receive large payloads skip loading pandas
+    import pandas as pd
+    return pd.DataFrame({'date': dates, 'quantity_sold': quantities})
 
-@router.post("/train", response_model=Dict[str, Any])
+
+async def _train_and_record(job_id: str, sales: "SalesData", product_id: str,
+                            store_id: Optional[str]) -> None:
+    """Train a model in the background and record the outcome under its job id."""
+    job = {"job_id": job_id, "product_id": product_id, "store_id": store_id}
+    _training_jobs[job_id] = {**job, "status": "running"}
+    
+    try:
+        # Prophet fitting takes seconds to minutes; keep it off the event loop
+        training_result = await run_in_threadpool(
+            get_forecaster().train, sales, product_id, store_id
+        )
+    except Exception as e:
+        logger.error(f"Error training model: {str(e)}")
+        _training_jobs[job_id] = {**job, "status": "failed", "error": str(e)}
+        return
+    
+    logger.info(f"Model training completed for product {product_id}, store {store_id}")
+    _training_jobs[job_id] = {**job, "status": "completed", "training_result": training_result}
+
+
+@router.post("/train", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
 async def train_forecasting_model(
-    request: Dict[str, Any],
+    request: ForecastTrainRequest,
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Train forecasting model for a product/store combination.
+    Queue training of a forecasting model for a product/store combination.
+    
+    Training runs in the background; poll ``/train/status/{job_id}`` for the result.
     
     Expected request format:
     {
@@ -41,35 +96,45 @@ async def train_forecasting_model(
     }
     """
     try:
-        product_id = request.get("product_id")
-        store_id = request.get("store_id")
-        sales_data = request.get("sales_data", [])
-        
-        if not product_id or not sales_data:
-            raise HTTPException(status_code=400, detail="product_id and sales_data are required")
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(sales_data)
-        df['date'] = pd.to_datetime(df['date'])
+        product_id = request.product_id
+        store_id = request.store_id
         
-        # Train model
-        training_result = prophet_forecaster.train(df, product_id, store_id)
+        # Queue training so the HTTP worker is freed immediately
+        job_id = uuid.uuid4().hex
+        _training_jobs[job_id] = {
+            "job_id": job_id,
+            "product_id": product_id,
+            "store_id": store_id,
+            "status": "queued"
+        }
+        background_tasks.add_task(
+            _train_and_record, job_id, _parse_sales_data(request.sales_data), product_id, store_id
+        )
         
-        logger.info(f"Model training completed for product {product_id}, store {store_id}")
         return {
-            "status": "success",
-            "message": "Model trained successfully",
-            "training_result": training_result
+            "status": "accepted",
+            "message": "Model training queued",
+            "job_id": job_id
         }
         
     except Exception as e:
-        logger.error(f"Error training model: {str(e)}")
+        logger.error(f"Error queueing model training: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Training failed: {str(e)}")
 
 
+@router.get("/train/status/{job_id}", response_model=Dict[str, Any])
+async def get_training_status(job_id: str):
+    """Get the status of a background training job."""
+    job = _training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No training job found for {job_id}")
+    
+    return job
+
+
 @router.post("/generate", response_model=Dict[str, Any])
 async def generate_forecast(
-    request: Dict[str, Any],
+    request: ForecastGenerateRequest,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -80,21 +145,16 @@ async def generate_forecast(
         "product_id": "string",
         "store_id": "string",  # optional
         "horizon_days": 30,
-        "include_components": true
+        "include_components": false  # see /{product_id}/components
     }
     """
     try:
-        product_id = request.get("product_id")
-        store_id = request.get("store_id")
-        horizon_days = request.get("horizon_days", 30)
-        include_components = request.get("include_components", True)
-        
-        if not product_id:
-            raise HTTPException(status_code=400, detail="product_id is required")
+        prophet_forecaster = get_forecaster()
+        product_id = request.product_id
+        store_id = request.store_id
         
         # Check if model exists
-        model_key = f"{product_id}_{store_id}" if store_id else product_id
-        if model_key not in prophet_forecaster.models:
+        if not prophet_forecaster.has_model(product_id, store_id):
             raise HTTPException(
                 status_code=404, 
                 detail=f"No trained model found for product {product_id}. Train the model first."
@@ -103,16 +163,21 @@ async def generate_forecast(
         # Generate forecast
         forecast_result = prophet_forecaster.forecast(
             product_id, 
-            horizon_days, 
+            request.horizon_days, 
             store_id, 
-            include_components
+            request.include_components
         )
         
-        return {
+        # Forecast series are NumPy arrays; ORJSONResponse serializes them natively,
+        # which response_model validation would not
+        return ORJSONResponse({
             "status": "success",
             "forecast": forecast_result
-        }
+        })
         
+    except HTTPException:
+        # Keep the 404 for a missing model; RemoteForecaster relies on it
+        raise
     except Exception as e:
         logger.error(f"Error generating forecast: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Forecast generation failed: {str(e)}")
@@ -120,29 +185,24 @@ async def generate_forecast(
 
 @router.post("/generate-ensemble", response_model=Dict[str, Any])
 async def generate_ensemble_forecast(
-    request: Dict[str, Any],
+    request: EnsembleForecastRequest,
     db: AsyncSession = Depends(get_db)
 ):
     """Generate ensemble forecast using multiple models."""
     try:
-        product_id = request.get("product_id")
-        store_id = request.get("store_id")
-        horizon_days = request.get("horizon_days", 30)
-        
-        if not product_id:
-            raise HTTPException(status_code=400, detail="product_id is required")
+        ensemble_forecaster = get_ensemble_forecaster()
         
         # Generate ensemble forecast
         ensemble_result = ensemble_forecaster.forecast_ensemble(
-            product_id, 
-            horizon_days, 
-            store_id
+            request.product_id, 
+            request.horizon_days, 
+            request.store_id
         )
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "ensemble_forecast": ensemble_result
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error generating ensemble forecast: {str(e)}")
@@ -157,12 +217,13 @@ async def get_forecast_performance(
 ):
     """Get forecast performance metrics for a specific product/store."""
     try:
-        model_key = f"{product_id}_{store_id}" if store_id else product_id
+        prophet_forecaster = get_forecaster()
+        model_key = (product_id, store_id or None)
         
         if model_key not in prophet_forecaster.performance_metrics:
             raise HTTPException(
                 status_code=404, 
-                detail=f"No performance metrics found for {model_key}"
+                detail=f"No performance metrics found for {format_model_key(model_key)}"
             )
         
         performance = prophet_forecaster.get_model_performance(product_id, store_id)
@@ -171,7 +232,7 @@ async def get_forecast_performance(
             "product_id": product_id,
             "store_id": store_id,
             "performance_metrics": performance,
-            "last_updated": datetime.now().isoformat()
+            "last_updated": datetime.now()
         }
         
     except Exception as e:
@@ -179,10 +240,43 @@ async def get_forecast_performance(
         raise HTTPException(status_code=500, detail=f"Failed to get performance metrics: {str(e)}")
 
 
+@router.get("/{product_id}/components")
+async def get_forecast_components(
+    product_id: str,
+    store_id: str = None,
+    horizon_days: int = Query(30, ge=1, le=365),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the trend/seasonality breakdown of a forecast for plotting."""
+    try:
+        prophet_forecaster = get_forecaster()
+        
+        if not prophet_forecaster.has_model(product_id, store_id):
+            raise HTTPException(
+                status_code=404, 
+                detail=f"No trained model found for product {product_id}. Train the model first."
+            )
+        
+        components = await run_forecast_task(
+            prophet_forecaster.forecast_components, product_id, horizon_days, store_id
+        )
+        
+        return ORJSONResponse({
+            "status": "success",
+            "components": components
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting forecast components: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get forecast components: {str(e)}")
+
+
 @router.post("/{product_id}/update")
 async def update_forecasting_model(
     product_id: str,
-    request: Dict[str, Any],
+    request: ForecastUpdateRequest,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -197,18 +291,11 @@ async def update_forecasting_model(
     }
     """
     try:
-        store_id = request.get("store_id")
-        new_sales_data = request.get("new_sales_data", [])
-        
-        if not new_sales_data:
-            raise HTTPException(status_code=400, detail="new_sales_data is required")
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(new_sales_data)
-        df['date'] = pd.to_datetime(df['date'])
-        
+        prophet_forecaster = get_forecaster()
         # Update model
-        update_result = prophet_forecaster.update_model(product_id, df, store_id)
+        update_result = prophet_forecaster.update_model(
+            product_id, _parse_sales_data(request.new_sales_data), request.store_id
+        )
         
         return {
             "status": "success",
@@ -225,19 +312,8 @@ async def update_forecasting_model(
 async def list_trained_models():
     """List all trained forecasting models."""
     try:
-        models = []
-        for model_key in prophet_forecaster.models.keys():
-            if '_' in model_key:
-                product_id, store_id = model_key.rsplit('_', 1)
-            else:
-                product_id, store_id = model_key, None
-            
-            models.append({
-                "product_id": product_id,
-                "store_id": store_id,
-                "model_key": model_key,
-                "has_performance_metrics": model_key in prophet_forecaster.performance_metrics
-            })
+        prophet_forecaster = get_forecaster()
+        models = list(prophet_forecaster.model_meta.values())
         
         return {
             "total_models": len(models),
@@ -249,6 +325,52 @@ async def list_trained_models():
         raise HTTPException(status_code=500, detail=f"Failed to list models: {str(e)}")
 
 
+@router.get("/forecasts", response_model=List[ForecastResponse])
+async def get_stored_forecasts(
+    store_id: Optional[EntityId] = None,
+    product_id: Optional[EntityId] = None,
+    since: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_ro_db)
+):
+    """List stored forecasts in forecast-date order."""
+    # Forecasts are rewritten in batches, so a list can be served for
+    # RESPONSE_CACHE_TTL seconds instead of re-running the query and serialization
+    cache_key = f"forecasts:v1:{store_id}:{product_id}:{since.isoformat() if since else ''}:{limit}"
+    cached = await cache.get_cached(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    try:
+        forecasts = await list_forecasts(db, store_id, product_id, since, limit)
+        content = forecasts_adapter.dump_json(forecasts)
+        await cache.set_cached(cache_key, content)
+        return Response(content=content, media_type="application/json")
+        
+    except Exception as e:
+        logger.error(f"Error listing stored forecasts: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to list stored forecasts")
+
+
+@router.get("/models/{product_id}")
+async def get_trained_model(product_id: str, store_id: Optional[str] = None):
+    """Get metadata for one trained model, or 404 if it has not been trained."""
+    prophet_forecaster = get_forecaster()
+    model_key = (product_id, store_id or None)
+    
+    if not prophet_forecaster.has_model(product_id, store_id):
+        raise HTTPException(
+            status_code=404,
+            detail=f"No trained model found for {format_model_key(model_key)}"
+        )
+    
+    return prophet_forecaster.model_meta.get(model_key, {
+        'product_id': product_id,
+        'store_id': store_id,
+        'model_key': format_model_key(model_key)
+    })
+
+
 @router.delete("/{product_id}")
 async def delete_forecasting_model(
     product_id: str,
@@ -257,22 +379,21 @@ async def delete_forecasting_model(
 ):
     """Delete a trained forecasting model."""
     try:
-        model_key = f"{product_id}_{store_id}" if store_id else product_id
+        prophet_forecaster = get_forecaster()
+        model_key = (product_id, store_id or None)
         
-        if model_key not in prophet_forecaster.models:
+        if not prophet_forecaster.has_model(product_id, store_id):
             raise HTTPException(
                 status_code=404, 
-                detail=f"No model found for {model_key}"
+                detail=f"No model found for {format_model_key(model_key)}"
             )
         
-        # Remove model and performance metrics
-        del prophet_forecaster.models[model_key]
-        if model_key in prophet_forecaster.performance_metrics:
-            del prophet_forecaster.performance_metrics[model_key]
+        # Remove model, performance metrics and cached forecasts
+        prophet_forecaster.delete_model(product_id, store_id)
         
         return {
             "status": "success",
-            "message": f"Model {model_key} deleted successfully"
+            "message": f"Model {format_model_key(model_key)} deleted successfully"
         }
         
     except Exception as e:
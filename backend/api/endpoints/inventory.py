@@ -2,73 +2,151 @@
 Inventory management endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict, Any
+from typing import Annotated, List, Dict, Any, Optional, Sequence
+import asyncio
+import hashlib
 import logging
+import numpy as np
+import orjson
+from pydantic import TypeAdapter
 
-from models.database import get_db
-from models.schemas import InventoryItem, InventoryUpdate
-from core.optimization.reorder_engine import ReorderPointEngine, ReorderPointConfig
-from core.forecasting.models import ProphetForecaster
+from models.database import get_db, get_ro_db
+from models.schemas import (
+    EntityId, InventoryItem, InventoryUpdate, ReorderRecommendationRequest, ReorderPointRequest
+)
+from core.optimization.reorder_engine import ReorderPointConfig
+from core.forecasting.registry import get_reorder_forecaster, get_reorder_engine, run_forecast_task
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Initialize engines
-reorder_engine = ReorderPointEngine()
-prophet_forecaster = ProphetForecaster()
+# Serializes inventory lists in one pass through pydantic-core
+_inventory_adapter = TypeAdapter(List[InventoryItem])
 
+# Shared engine; the forecaster is fetched per call so Prophet loads on first use
+# (or never, when forecasts come from a separate forecasting service)
+reorder_engine = get_reorder_engine()
 
-@router.get("/", response_model=List[InventoryItem])
-async def get_inventory(db: AsyncSession = Depends(get_db)):
-    """Get all inventory items."""
-    # Mock implementation - replace with actual database query
-    mock_inventory = [
-        InventoryItem(
-            id="inv_001",
-            product_id="prod_001",
-            store_id="store_001",
-            quantity=150,
-            reorder_point=100,
-            safety_stock=50,
-            unit_cost=25.99,
-            last_updated="2024-01-15T10:00:00Z"
-        ),
-        InventoryItem(
-            id="inv_002",
-            product_id="prod_002",
-            store_id="store_001",
-            quantity=75,
-            reorder_point=120,
-            safety_stock=60,
-            unit_cost=15.50,
-            last_updated="2024-01-15T10:00:00Z"
-        )
-    ]
-    return mock_inventory
+# Dashboards poll inventory every second; let clients reuse a response briefly
+INVENTORY_CACHE_CONTROL = "max-age=5"
 
+# Mock 30 days of demand used when no trained model is available; shared across
+# items (the engine only reads it) instead of being rebuilt for every line
+FALLBACK_DAILY_DEMAND = [10] * 30
 
-@router.get("/{item_id}", response_model=InventoryItem)
-async def get_inventory_item(item_id: str, db: AsyncSession = Depends(get_db)):
-    """Get a specific inventory item."""
-    # Mock implementation - replace with actual database query
-    mock_item = InventoryItem(
-        id=item_id,
-        product_id="prod_001",
-        store_id="store_001",
+# 30 days of forecast should cover most lead times
+REORDER_FORECAST_HORIZON_DAYS = 30
+
+
+def _forecast_if_trained(forecaster, product_id: str, store_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Forecast the reorder horizon, or return None when no model is trained.
+    
+    Runs on the forecast executor: has_model may call the forecasting service or
+    parse a persisted model, and forecast runs Prophet predict, so neither may
+    block the event loop.
+    """
+    if not forecaster.has_model(product_id, store_id):
+        return None
+    return forecaster.forecast(
+        product_id,
+        REORDER_FORECAST_HORIZON_DAYS,
+        store_id,
+        include_components=False
+    )
+
+
+async def _get_reorder_forecast(product_id: str, store_id: Optional[str]) -> Sequence[float]:
+    """Get daily P90 demand for reorder calculations, falling back to mock demand."""
+    # Repeat requests are served from the forecaster's own cache
+    forecast = await run_forecast_task(
+        _forecast_if_trained, get_reorder_forecaster(), product_id, store_id
+    )
+    if forecast is None:
+        logger.warning(f"No trained model for {product_id}, using mock data")
+        return FALLBACK_DAILY_DEMAND
+    
+    # Extract P90 forecasts for reorder calculations, falling back to P50
+    if 'p90_forecast' in forecast:
+        return forecast['p90_forecast']
+    return forecast.get('p50_forecast', [])
+
+
+def _compute_etag(content: bytes) -> str:
+    """Compute a strong ETag for a serialized response body."""
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def _etag_response(request: Request, content: bytes, etag: str) -> Response:
+    """Return the JSON body, or 304 Not Modified if the client already has it."""
+    headers = {"ETag": etag, "Cache-Control": INVENTORY_CACHE_CONTROL}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in client_etags or "*" in client_etags:
+            return Response(status_code=304, headers=headers)
+    
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+# Inventory item ids are GUIDs. Path() keeps the EntityId check: FastAPI 0.104
+# drops validators from a bare Annotated path parameter
+InventoryItemId = Annotated[EntityId, Path(description="Inventory item ID")]
+
+
+# Mock inventory data is static, so validate and serialize it once at import
+# instead of rebuilding Pydantic models on every request
+_MOCK_INVENTORY = [
+    InventoryItem(
+        id="1a7e0000000040008000000000000001",
+        product_id="9d0c0000000040008000000000000001",
+        store_id="5c010000000040008000000000000001",
         quantity=150,
         reorder_point=100,
         safety_stock=50,
         unit_cost=25.99,
         last_updated="2024-01-15T10:00:00Z"
+    ),
+    InventoryItem(
+        id="1a7e0000000040008000000000000002",
+        product_id="9d0c0000000040008000000000000002",
+        store_id="5c010000000040008000000000000001",
+        quantity=75,
+        reorder_point=120,
+        safety_stock=60,
+        unit_cost=15.50,
+        last_updated="2024-01-15T10:00:00Z"
     )
-    return mock_item
+]
+_MOCK_INVENTORY_JSON = _inventory_adapter.dump_json(_MOCK_INVENTORY)
+_MOCK_INVENTORY_ETAG = _compute_etag(_MOCK_INVENTORY_JSON)
+
+# Single-item mock payload; only the id varies per request
+_MOCK_INVENTORY_ITEM = _MOCK_INVENTORY[0].model_dump(mode="json")
+
+
+@router.get("/", response_model=List[InventoryItem])
+async def get_inventory(request: Request, db: AsyncSession = Depends(get_ro_db)):
+    """Get all inventory items."""
+    # Mock implementation - replace with actual database query
+    return _etag_response(request, _MOCK_INVENTORY_JSON, _MOCK_INVENTORY_ETAG)
+
+
+@router.get("/{item_id}", response_model=InventoryItem)
+async def get_inventory_item(item_id: InventoryItemId, request: Request, db: AsyncSession = Depends(get_ro_db)):
+    """Get a specific inventory item."""
+    # Mock implementation - replace with actual database query
+    content = orjson.dumps({**_MOCK_INVENTORY_ITEM, "id": item_id})
+    return _etag_response(request, content, _compute_etag(content))
 
 
 @router.put("/{item_id}", response_model=InventoryItem)
 async def update_inventory(
-    item_id: str,
+    item_id: InventoryItemId,
     update: InventoryUpdate,
     db: AsyncSession = Depends(get_db)
 ):
@@ -76,8 +154,8 @@ async def update_inventory(
     # Mock implementation - replace with actual database update
     mock_item = InventoryItem(
         id=item_id,
-        product_id="prod_001",
-        store_id="store_001",
+        product_id="9d0c0000000040008000000000000001",
+        store_id="5c010000000040008000000000000001",
         quantity=update.quantity,
         reorder_point=update.reorder_point or 100,
         safety_stock=update.safety_stock or 50,
@@ -89,7 +167,7 @@ async def update_inventory(
 
 @router.post("/reorder-recommendations", response_model=List[Dict[str, Any]])
 async def get_reorder_recommendations(
-    request: Dict[str, Any],
+    request: ReorderRecommendationRequest,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -115,84 +193,53 @@ async def get_reorder_recommendations(
     }
     """
     try:
-        inventory_items = request.get("inventory_items", [])
-        config_data = request.get("config", {})
-        
-        if not inventory_items:
-            raise HTTPException(status_code=400, detail="inventory_items is required")
+        inventory_items = request.inventory_items
         
         # Create reorder configuration
-        config = ReorderPointConfig(
-            service_level=config_data.get("service_level", 0.95),
-            lead_time_days=config_data.get("lead_time_days", 7),
-            lead_time_std_days=config_data.get("lead_time_std_days", 2.0),
-            min_order_quantity=config_data.get("min_order_quantity", 1),
-            case_pack_size=config_data.get("case_pack_size", 1),
-            budget_cap=config_data.get("budget_cap")
-        )
+        config = ReorderPointConfig(**request.config.model_dump())
         
-        # Get forecasts for all products
+        # Forecast each unique product/store once, concurrently, rather than once per line
+        unique_keys = list(dict.fromkeys(
+            (item.product_id, item.store_id) for item in inventory_items
+        ))
+        forecasts = await asyncio.gather(
+            *(_get_reorder_forecast(product_id, store_id) for product_id, store_id in unique_keys),
+            return_exceptions=True
+        )
+        # Keyed by product and store: a product stocked at several stores has a
+        # separate forecast per store
         forecast_data = {}
+        for (product_id, store_id), daily_forecasts in zip(unique_keys, forecasts):
+            if isinstance(daily_forecasts, Exception):
+                logger.warning(f"Failed to get forecast for {product_id}: {str(daily_forecasts)}")
+                daily_forecasts = FALLBACK_DAILY_DEMAND
+            forecast_data[(product_id, store_id)] = daily_forecasts
+        
+        # Items without enough forecast data to cover the lead time are skipped
+        items = []
         for item in inventory_items:
-            product_id = item["product_id"]
-            store_id = item.get("store_id")
-            
-            # Check if we have a trained model
-            model_key = f"{product_id}_{store_id}" if store_id else product_id
-            
-            if model_key in prophet_forecaster.models:
-                try:
-                    # Generate 30-day forecast for reorder calculations
-                    forecast = prophet_forecaster.forecast(
-                        product_id, 
-                        30,  # 30 days should cover most lead times
-                        store_id,
-                        include_components=False
-                    )
-                    
-                    # Extract P90 forecasts for reorder calculations
-                    if 'p90_forecast' in forecast:
-                        forecast_data[product_id] = forecast['p90_forecast']
-                    else:
-                        # Fallback to P50 if P90 not available
-                        forecast_data[product_id] = forecast.get('p50_forecast', [])
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to get forecast for {product_id}: {str(e)}")
-                    # Use mock forecast data as fallback
-                    forecast_data[product_id] = [10] * 30  # Mock 30 days of demand
-            else:
-                logger.warning(f"No trained model for {product_id}, using mock data")
-                # Use mock forecast data
-                forecast_data[product_id] = [10] * 30  # Mock 30 days of demand
+            if len(forecast_data[(item.product_id, item.store_id)]) < config.lead_time_days:
+                logger.warning(f"Insufficient forecast data for product {item.product_id}")
+                continue
+            items.append(item)
         
-        # Generate reorder recommendations
-        recommendations = reorder_engine.batch_reorder_recommendations(
-            inventory_items,
-            forecast_data,
-            {item["product_id"]: config for item in inventory_items}
+        # Generate reorder recommendations from structure-of-arrays inputs
+        n = len(items)
+        recommendations = reorder_engine.batch_reorder_records(
+            [item.product_id for item in items],
+            [item.store_id or "default" for item in items],
+            np.fromiter((item.current_inventory for item in items), dtype=np.float64, count=n),
+            np.fromiter((item.unit_cost for item in items), dtype=np.float64, count=n),
+            np.array(
+                [forecast_data[(item.product_id, item.store_id)][:config.lead_time_days] for item in items],
+                dtype=np.float32
+            ).reshape(n, config.lead_time_days),
+            config
         )
         
-        # Convert to serializable format
-        result = []
-        for rec in recommendations:
-            result.append({
-                "product_id": rec.product_id,
-                "store_id": rec.store_id,
-                "current_inventory": rec.current_inventory,
-                "reorder_point": rec.reorder_point,
-                "reorder_quantity": rec.reorder_quantity,
-                "safety_stock": rec.safety_stock,
-                "demand_during_lt": rec.demand_during_lt,
-                "lead_time_days": rec.lead_time_days,
-                "service_level": rec.service_level,
-                "total_cost": rec.total_cost,
-                "urgency": rec.urgency,
-                "recommendation_date": rec.recommendation_date.isoformat(),
-                "reasoning": rec.reasoning
-            })
-        
-        return result
+        # Records are already plain Python values; returning the response directly
+        # skips FastAPI's jsonable_encoder walk over every row
+        return ORJSONResponse(recommendations)
         
     except Exception as e:
         logger.error(f"Error generating reorder recommendations: {str(e)}")
@@ -201,7 +248,7 @@ async def get_reorder_recommendations(
 
 @router.post("/reorder-points/calculate", response_model=Dict[str, Any])
 async def calculate_reorder_points(
-    request: Dict[str, Any],
+    request: ReorderPointRequest,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -221,45 +268,27 @@ async def calculate_reorder_points(
     }
     """
     try:
-        product_id = request.get("product_id")
-        store_id = request.get("store_id")
-        current_inventory = request.get("current_inventory", 0)
-        unit_cost = request.get("unit_cost", 0.0)
-        config_data = request.get("config", {})
-        
-        if not product_id:
-            raise HTTPException(status_code=400, detail="product_id is required")
+        product_id = request.product_id
+        store_id = request.store_id
         
         # Create configuration
-        config = ReorderPointConfig(
-            service_level=config_data.get("service_level", 0.95),
-            lead_time_days=config_data.get("lead_time_days", 7),
-            lead_time_std_days=config_data.get("lead_time_std_days", 2.0),
-            min_order_quantity=config_data.get("min_order_quantity", 1),
-            case_pack_size=config_data.get("case_pack_size", 1)
-        )
+        config = ReorderPointConfig(**request.config.model_dump())
         
         # Get forecast data
-        model_key = f"{product_id}_{store_id}" if store_id else product_id
+        forecast = await run_forecast_task(
+            _forecast_if_trained, get_reorder_forecaster(), product_id, store_id
+        )
         
-        if model_key not in prophet_forecaster.models:
+        if forecast is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"No trained model found for {product_id}. Train the model first."
             )
         
-        # Generate forecast
-        forecast = prophet_forecaster.forecast(
-            product_id,
-            30,  # 30 days for reorder calculations
-            store_id,
-            include_components=False
-        )
-        
         # Extract P90 forecasts
         daily_forecasts = forecast.get('p90_forecast', forecast.get('p50_forecast', []))
         
-        if not daily_forecasts:
+        if len(daily_forecasts) == 0:
             raise HTTPException(
                 status_code=500,
                 detail="No forecast data available"
@@ -269,9 +298,9 @@ async def calculate_reorder_points(
         recommendation = reorder_engine.generate_reorder_recommendation(
             product_id=product_id,
             store_id=store_id,
-            current_inventory=current_inventory,
+            current_inventory=request.current_inventory,
             daily_forecasts=daily_forecasts,
-            unit_cost=unit_cost,
+            unit_cost=request.unit_cost,
             config=config
         )
         
@@ -289,11 +318,13 @@ async def calculate_reorder_points(
                 "service_level": recommendation.service_level,
                 "total_cost": recommendation.total_cost,
                 "urgency": recommendation.urgency,
-                "recommendation_date": recommendation.recommendation_date.isoformat(),
+                "recommendation_date": recommendation.recommendation_date,
                 "reasoning": recommendation.reasoning
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error calculating reorder points: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Calculation failed: {str(e)}")
@@ -303,7 +334,7 @@ async def calculate_reorder_points(
 async def get_reorder_point(
     product_id: str,
     store_id: str = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_ro_db)
 ):
     """Get current reorder point for a product."""
     # Mock implementation - replace with actual database query
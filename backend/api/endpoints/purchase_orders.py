@@ -3,35 +3,45 @@ from datetime import timedelta
 Purchase order endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import datetime
+from pydantic import TypeAdapter
+import uuid
 
-from models.database import get_db
+from models.database import get_db, get_ro_db
 from models.schemas import PurchaseOrderResponse, PurchaseOrderCreate
 
 router = APIRouter()
 
+# Serializes purchase order lists in one pass through pydantic-core
+_purchase_orders_adapter = TypeAdapter(List[PurchaseOrderResponse])
+
+# Mock PO data is static, so validate and serialize it once at import
+# instead of rebuilding Pydantic models on every request
+_MOCK_PURCHASE_ORDERS = [
+    PurchaseOrderResponse(
+        id="7f0d0000000040008000000000000001",
+        po_number="PO-2024-001",
+        supplier_id="3b5a0000000040008000000000000001",
+        store_id="5c010000000040008000000000000001",
+        status="pending_approval",
+        total_amount=2500.00,
+        expected_delivery_date=datetime.now() + timedelta(days=14),
+        created_by="2e4b0000000040008000000000000001",
+        approved_by=None,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+]
+_MOCK_PURCHASE_ORDERS_JSON = _purchase_orders_adapter.dump_json(_MOCK_PURCHASE_ORDERS)
+
 @router.get("/", response_model=List[PurchaseOrderResponse])
-async def get_purchase_orders(db: AsyncSession = Depends(get_db)):
+async def get_purchase_orders(db: AsyncSession = Depends(get_ro_db)):
     """Get all purchase orders."""
     # Mock PO data
-    return [
-        PurchaseOrderResponse(
-            id="po_1",
-            po_number="PO-2024-001",
-            supplier_id="supp_1",
-            store_id="store_1",
-            status="pending_approval",
-            total_amount=2500.00,
-            expected_delivery_date=datetime.now() + timedelta(days=14),
-            created_by="user_1",
-            approved_by=None,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-    ]
+    return Response(content=_MOCK_PURCHASE_ORDERS_JSON, media_type="application/json")
 
 @router.post("/", response_model=PurchaseOrderResponse)
 async def create_purchase_order(
@@ -41,14 +51,14 @@ async def create_purchase_order(
     """Create a new purchase order."""
     # Mock creation
     return PurchaseOrderResponse(
-        id="po_new",
+        id=uuid.uuid4().hex,
         po_number="PO-2024-002",
         supplier_id=po.supplier_id,
         store_id=po.store_id,
         status="draft",
         total_amount=0.00,
         expected_delivery_date=po.expected_delivery_date,
-        created_by="user_1",
+        created_by="2e4b0000000040008000000000000001",
         approved_by=None,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
@@ -0,0 +1,87 @@
+"""
+Sales ingest endpoints.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import IntegrityError, StatementError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import logging
+
+from models.database import SalesTransaction, bulk_insert, get_db, get_ro_db
+from models.queries import list_sales_transactions, sales_transactions_adapter
+from models.schemas import EntityId, SalesTransactionCreate, SalesTransactionResponse
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Parses and validates a whole JSON batch in one pydantic-core pass, then dumps
+# it back to plain dicts for the insert without per-record model_dump calls
+_sales_batch_adapter = TypeAdapter(List[SalesTransactionCreate])
+
+
+@router.get("/", response_model=List[SalesTransactionResponse])
+async def get_sales_transactions(
+    store_id: Optional[EntityId] = None,
+    product_id: Optional[EntityId] = None,
+    since: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_ro_db)
+):
+    """List sales transactions, newest first."""
+    try:
+        transactions = await list_sales_transactions(db, store_id, product_id, since, limit)
+        return Response(
+            content=sales_transactions_adapter.dump_json(transactions),
+            media_type="application/json"
+        )
+        
+    except Exception as e:
+        logger.error(f"Error listing sales transactions: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to list sales transactions")
+
+@router.post("/bulk", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+async def ingest_sales_transactions(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Ingest a batch of POS sales transactions.
+    
+    Expected request format (a JSON array):
+    [
+        {
+            "store_id": "uuid",
+            "product_id": "uuid",
+            "transaction_date": "2024-01-15T10:00:00",
+            "quantity_sold": 2,
+            "unit_price": 9.99,
+            "total_amount": 19.98
+        }
+    ]
+    """
+    try:
+        records = _sales_batch_adapter.validate_json(await request.body())
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    
+    try:
+        rows = _sales_batch_adapter.dump_python(records)
+        await bulk_insert(db, SalesTransaction, rows)
+        # Commit before responding; get_db's own commit runs after the response
+        await db.commit()
+        
+        return {
+            "status": "success",
+            "inserted": len(rows)
+        }
+        
+    except IntegrityError as e:
+        logger.warning(f"Rejected sales batch violating constraints: {str(e)}")
+        raise HTTPException(status_code=409, detail="Sales transactions reference unknown stores or products")
+    except (StatementError, ValueError) as e:
+        logger.warning(f"Rejected sales batch with unbindable values: {str(e)}")
+        raise HTTPException(status_code=422, detail="Sales transactions contain invalid values")
+    except Exception as e:
+        # Database errors carry the SQL and parameters, so only the log gets them
+        logger.error(f"Error ingesting sales transactions: {str(e)}")
+        raise HTTPException(status_code=500, detail="Sales ingest failed")
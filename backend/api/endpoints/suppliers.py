@@ -2,47 +2,56 @@
 Supplier endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import datetime
+from pydantic import TypeAdapter
 
-from models.database import get_db
+from models.database import get_ro_db
 from models.schemas import SupplierResponse
 
 router = APIRouter()
 
+# Serializes supplier lists in one pass through pydantic-core
+_suppliers_adapter = TypeAdapter(List[SupplierResponse])
+
+# Mock supplier data is static, so validate and serialize it once at import
+# instead of rebuilding Pydantic models on every request
+_MOCK_SUPPLIERS = [
+    SupplierResponse(
+        id="3b5a0000000040008000000000000001",
+        name="ABC Suppliers",
+        code="ABC",
+        contact_email="contact@abcsuppliers.com",
+        contact_phone="+1-555-0123",
+        address="123 Supplier St, City, State 12345",
+        lead_time_days=7,
+        lead_time_variance_days=2,
+        payment_terms="Net 30",
+        is_active=True,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    ),
+    SupplierResponse(
+        id="3b5a0000000040008000000000000002",
+        name="XYZ Manufacturing",
+        code="XYZ",
+        contact_email="orders@xyzmanufacturing.com",
+        contact_phone="+1-555-0456",
+        address="456 Factory Ave, City, State 12345",
+        lead_time_days=14,
+        lead_time_variance_days=3,
+        payment_terms="Net 45",
+        is_active=True,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+]
+_MOCK_SUPPLIERS_JSON = _suppliers_adapter.dump_json(_MOCK_SUPPLIERS)
+
 @router.get("/", response_model=List[SupplierResponse])
-async def get_suppliers(db: AsyncSession = Depends(get_db)):
+async def get_suppliers(db: AsyncSession = Depends(get_ro_db)):
     """Get all suppliers."""
-    # Mock supplier data
-    return [
-        SupplierResponse(
-            id="supp_1",
-            name="ABC Suppliers",
-            code="ABC",
-            contact_email="contact@abcsuppliers.com",
-            contact_phone="+1-555-0123",
-            address="123 Supplier St, City, State 12345",
-            lead_time_days=7,
-            lead_time_variance_days=2,
-            payment_terms="Net 30",
-            is_active=True,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        ),
-        SupplierResponse(
-            id="supp_2",
-            name="XYZ Manufacturing",
-            code="XYZ",
-            contact_email="orders@xyzmanufacturing.com",
-            contact_phone="+1-555-0456",
-            address="456 Factory Ave, City, State 12345",
-            lead_time_days=14,
-            lead_time_variance_days=3,
-            payment_terms="Net 45",
-            is_active=True,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-    ]
+    # Mock supplier data - replace with actual database query
+    return Response(content=_MOCK_SUPPLIERS_JSON, media_type="application/json")
@@ -0,0 +1,83 @@
+"""
+Redis-backed cache for serialized, query-backed list responses.
+
+Stores already-encoded JSON bodies so a hit skips the query and serialization
+entirely. The cache fails open: if Redis is unreachable, callers fall through
+to the database and Redis is not retried until a short backoff has passed.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds to stop trying Redis after a connection failure
+REDIS_RETRY_BACKOFF_SECONDS = 30.0
+
+_redis = None
+_unavailable_until = 0.0
+
+
+def _get_client():
+    """Create the shared Redis client on first use."""
+    global _redis
+    if _redis is None:
+        from redis.asyncio import Redis
+        _redis = Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        )
+    return _redis
+
+
+def _enabled() -> bool:
+    return settings.RESPONSE_CACHE_TTL > 0 and time.monotonic() >= _unavailable_until
+
+
+def _mark_unavailable(e: Exception) -> None:
+    global _unavailable_until
+    _unavailable_until = time.monotonic() + REDIS_RETRY_BACKOFF_SECONDS
+    logger.warning(f"Response cache unavailable, bypassing Redis: {str(e)}")
+
+
+async def get_cached(key: str) -> Optional[bytes]:
+    """Return the cached response body for a key, or None on a miss."""
+    if not _enabled():
+        return None
+    try:
+        return await _get_client().get(key)
+    except Exception as e:
+        _mark_unavailable(e)
+        return None
+
+
+async def set_cached(key: str, content: bytes, ttl: Optional[int] = None) -> None:
+    """Cache a response body for ttl seconds (RESPONSE_CACHE_TTL by default)."""
+    if not _enabled():
+        return
+    try:
+        await _get_client().setex(key, ttl or settings.RESPONSE_CACHE_TTL, content)
+    except Exception as e:
+        _mark_unavailable(e)
+
+
+async def invalidate(*keys: str) -> None:
+    """Drop cached responses after the underlying data changes."""
+    if not _enabled():
+        return
+    try:
+        await _get_client().delete(*keys)
+    except Exception as e:
+        _mark_unavailable(e)
+
+
+async def close() -> None:
+    """Close the shared Redis client, if one was created."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
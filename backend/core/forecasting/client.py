@@ -0,0 +1,84 @@
+"""
+HTTP client for a separately deployed forecasting service.
+
+Lets request-serving workers get forecasts without importing Prophet, pandas
+or Stan. The service is this same application, deployed on its own and
+serving the forecasting router.
+"""
+
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteForecaster:
+    """
+    Forecast client with the subset of the ProphetForecaster API used by the
+    reorder endpoints.
+    """
+    
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self._client = httpx.Client(base_url=base_url.rstrip("/"), timeout=timeout)
+    
+    def has_model(self, product_id: str, store_id: Optional[str] = None) -> bool:
+        """
+        Check whether the forecasting service has a trained model.
+        
+        Args:
+            product_id: Product identifier
+            store_id: Store identifier (optional)
+            
+        Returns:
+            True if the service has (or can load) the model, False on a 404
+        """
+        response = self._client.get(
+            f"/api/v1/forecasting/models/{quote(product_id, safe='')}",
+            params={"store_id": store_id} if store_id else None
+        )
+        if response.status_code == 404:
+            return False
+        if response.status_code != 200:
+            raise ValueError(
+                f"Forecasting service returned {response.status_code} for {product_id}: {response.text}"
+            )
+        
+        return True
+    
+    def forecast(self, product_id: str, horizon_days: int,
+                 store_id: Optional[str] = None,
+                 include_components: bool = False) -> Dict[str, Any]:
+        """
+        Request a forecast from the forecasting service.
+        
+        Args:
+            product_id: Product identifier
+            horizon_days: Number of days to forecast
+            store_id: Store identifier (optional)
+            include_components: Whether to include trend/seasonality breakdown
+            
+        Returns:
+            Forecast results in the same format as ProphetForecaster.forecast
+        """
+        response = self._client.post("/api/v1/forecasting/generate", json={
+            "product_id": product_id,
+            "store_id": store_id,
+            "horizon_days": horizon_days,
+            "include_components": include_components
+        })
+        if response.status_code == 404:
+            # Same error ProphetForecaster.forecast raises for a missing model
+            raise ValueError(f"No trained model found for {product_id}")
+        if response.status_code != 200:
+            raise ValueError(
+                f"Forecasting service returned {response.status_code} for {product_id}: {response.text}"
+            )
+        
+        return response.json()["forecast"]
+    
+    def close(self) -> None:
+        """Close the underlying connection pool."""
+        self._client.close()
@@ -0,0 +1,38 @@
+"""
+Model key helpers shared by the forecaster and the API layer.
+
+Kept free of Prophet/pandas imports so routers can use them without loading
+the forecasting stack.
+"""
+
+import hashlib
+import json
+from typing import Optional, Tuple
+
+# Models are keyed by (product_id, store_id); store_id is None for chain-wide models
+ModelKey = Tuple[str, Optional[str]]
+
+
+def format_model_key(model_key: ModelKey) -> str:
+    """Render a model key for messages and API responses."""
+    product_id, store_id = model_key
+    return f"{product_id}:{store_id or ''}"
+
+
+def model_file_stem(model_key: ModelKey) -> str:
+    """
+    Derive the on-disk file name (without extension) for a model key.
+    
+    The name is a hash of the JSON-encoded key, so distinct keys never share a
+    file and ids cannot steer the path outside the model directory.
+    
+    Args:
+        model_key: (product_id, store_id) tuple
+        
+    Returns:
+        Hex digest to use as the file name stem
+    """
+    for part in model_key:
+        if part is not None and ('/' in part or '\\' in part or '\x00' in part):
+            raise ValueError(f"Invalid model key {format_model_key(model_key)}: ids must not contain path separators")
+    return hashlib.sha256(json.dumps(list(model_key)).encode()).hexdigest()
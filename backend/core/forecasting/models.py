@@ -4,16 +4,203 @@ Core forecasting models for demand prediction using Prophet.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any
-from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple, Optional, Any, Union
+from datetime import datetime
+import fcntl
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from cachetools import LFUCache, LRUCache
+from joblib import Parallel, delayed
 from prophet import Prophet
 from prophet.diagnostics import cross_validation, performance_metrics
+from prophet.make_holidays import make_holidays_df
+from prophet.models import CmdStanPyBackend
+from prophet.serialize import model_to_json, model_from_json
 import warnings
 
+from core.forecasting.keys import ModelKey, format_model_key, model_file_stem
+
 warnings.filterwarnings('ignore')
 logger = logging.getLogger(__name__)
 
+# Every Prophet() builds a CmdStanPyBackend, whose load_model() wraps the
+# bundled Stan executable in a new CmdStanModel (probing the binary each time).
+# The executable is the same for every model, so the models built here load it
+# once per process and share it; CmdStanModel keeps no per-fit state.
+class _SharedStanBackend(CmdStanPyBackend):
+    """CmdStanPy backend that reuses one loaded Stan model per process."""
+    
+    _shared_model = None
+    _shared_model_lock = threading.Lock()
+    
+    def load_model(self):
+        cls = _SharedStanBackend
+        if cls._shared_model is None:
+            with cls._shared_model_lock:
+                if cls._shared_model is None:
+                    cls._shared_model = super().load_model()
+        return cls._shared_model
+
+
+class _RetailProphet(Prophet):
+    """
+    Prophet fitted through _SharedStanBackend.
+    
+    Prophet's stan_backend argument only selects a backend by name, so the
+    shared backend is installed through the constructor's loading hook instead.
+    """
+    
+    def _load_stan_backend(self, stan_backend):
+        self.stan_backend = _SharedStanBackend()
+
+
+# Sales history as a DataFrame (date, quantity_sold) or as parallel
+# (datetime64 dates, quantities) arrays for small payloads
+SalesData = Union[pd.DataFrame, Tuple[np.ndarray, np.ndarray]]
+
+
+def _forecast_array(values: Any) -> np.ndarray:
+    """
+    Freeze forecast values as a read-only contiguous array.
+    
+    Forecast results are cached and shared between callers, and are serialized
+    by orjson directly (contiguous arrays only), so they stay NumPy end to end.
+    """
+    array = np.ascontiguousarray(values)
+    array.flags.writeable = False
+    return array
+
+
+# US holiday table shared by every model. add_country_holidays() rebuilds it
+# from the holidays package on every fit; passing it as holidays= reuses it.
+US_HOLIDAYS = make_holidays_df(year_list=list(range(2015, 2036)), country='US')
+
+# Minimum history (days) before a seasonality is fitted; shorter spans cannot
+# identify it and only add Fourier regressors that slow Stan's L-BFGS
+MIN_DAYS_YEARLY_SEASONALITY = 540
+MIN_DAYS_QUARTERLY_SEASONALITY = 200
+
+
+def _round_to_int(values: np.ndarray) -> np.ndarray:
+    """Round to the nearest integer straight into an int64 array, skipping the float temporary."""
+    return np.rint(values, out=np.empty(values.shape, dtype=np.int64), casting='unsafe')
+
+
+def _build_model(model_params: Dict[str, Any], span_days: int) -> Prophet:
+    """
+    Create an unfitted Prophet model with the retail seasonalities and holidays.
+    
+    Args:
+        model_params: Forecaster configuration (see ProphetForecaster._model_params)
+        span_days: Days covered by the training history
+        
+    Returns:
+        Unfitted Prophet model
+    """
+    model = _RetailProphet(
+        seasonality_mode=model_params['seasonality_mode'],
+        changepoint_prior_scale=model_params['changepoint_prior_scale'],
+        seasonality_prior_scale=model_params['seasonality_prior_scale'],
+        daily_seasonality=False,
+        weekly_seasonality=True,
+        yearly_seasonality=span_days >= MIN_DAYS_YEARLY_SEASONALITY,
+        interval_width=model_params['confidence_level'],
+        uncertainty_samples=model_params['uncertainty_samples'],
+        # Holiday effects for major retail periods
+        holidays=US_HOLIDAYS
+    )
+    
+    # Add custom seasonalities for retail
+    model.add_seasonality(
+        name='monthly', 
+        period=30.5, 
+        fourier_order=3
+    )
+    if span_days >= MIN_DAYS_QUARTERLY_SEASONALITY:
+        model.add_seasonality(
+            name='quarterly', 
+            period=91.25, 
+            fourier_order=4
+        )
+    
+    return model
+
+
+def _cross_validate(model: Prophet, parallel: Optional[str] = None) -> Dict[str, float]:
+    """
+    Cross-validate a fitted model and summarize its performance.
+    
+    Args:
+        model: Fitted Prophet model
+        parallel: Prophet cross-validation backend (None, 'threads', 'processes' or 'dask')
+        
+    Returns:
+        Mean error and coverage metrics across cutoffs
+    """
+    # Each cutoff refits the model; the parallel backend runs those fits concurrently
+    cv_results = cross_validation(
+        model, 
+        initial='90 days', 
+        period='30 days', 
+        horizon='30 days',
+        parallel=parallel,
+        disable_tqdm=True
+    )
+    
+    perf_metrics = performance_metrics(cv_results)
+    return {
+        'mae': perf_metrics['mae'].mean(),
+        'mape': perf_metrics['mape'].mean(),
+        'rmse': perf_metrics['rmse'].mean(),
+        'mdape': perf_metrics['mdape'].mean(),
+        'smape': perf_metrics['smape'].mean(),
+        'coverage': perf_metrics['coverage'].mean()
+    }
+
+
+def _train_one(model_key: ModelKey, prophet_df: pd.DataFrame, model_params: Dict[str, Any],
+               cv_parallel: Optional[str] = None) -> Tuple[ModelKey, Prophet, Dict[str, float]]:
+    """
+    Fit and cross-validate one model.
+    
+    Module-level and free of forecaster state so it can be pickled to worker
+    processes by train_many.
+    
+    Returns:
+        (model_key, fitted model, performance metrics)
+    """
+    span_days = (prophet_df['ds'].iloc[-1] - prophet_df['ds'].iloc[0]).days
+    model = _build_model(model_params, span_days)
+    model.fit(prophet_df)
+    return model_key, model, _cross_validate(model, cv_parallel)
+
+
+def _try_train_one(model_key: ModelKey, prophet_df: pd.DataFrame,
+                   model_params: Dict[str, Any]) -> Tuple[ModelKey, Optional[Prophet], Any]:
+    """Run _train_one in a worker process, returning the error message instead of raising."""
+    try:
+        return _train_one(model_key, prophet_df, model_params)
+    except Exception as e:
+        return model_key, None, str(e)
+
+
+class _ModelCache(LRUCache):
+    """LRU cache of trained models that reports evictions to its owner."""
+    
+    def __init__(self, maxsize: int, on_evict: Callable[[ModelKey], None]):
+        super().__init__(maxsize=maxsize)
+        self._on_evict = on_evict
+    
+    def popitem(self):
+        model_key, model = super().popitem()
+        self._on_evict(model_key)
+        return model_key, model
+
 
 class ProphetForecaster:
     """
@@ -24,43 +211,263 @@ class ProphetForecaster:
                  confidence_level: float = 0.95,
                  seasonality_mode: str = 'multiplicative',
                  changepoint_prior_scale: float = 0.05,
-                 seasonality_prior_scale: float = 10.0):
+                 seasonality_prior_scale: float = 10.0,
+                 forecast_cache_size: int = 1024,
+                 model_dir: Optional[str] = None,
+                 cv_parallel: Optional[str] = None,
+                 uncertainty_samples: int = 100,
+                 max_models: int = 512):
         self.confidence_level = confidence_level
         self.seasonality_mode = seasonality_mode
         self.changepoint_prior_scale = changepoint_prior_scale
         self.seasonality_prior_scale = seasonality_prior_scale
-        self.models = {}
+        self.model_dir = model_dir
+        # Prophet's cross-validation backend for cutoff fits: None (serial),
+        # 'threads', 'processes' or 'dask'
+        self.cv_parallel = cv_parallel
+        # Monte Carlo draws behind yhat_lower/yhat_upper. P90 is derived
+        # analytically from the interval, so a few hundred draws are plenty;
+        # 0 skips sampling and yields point forecasts only.
+        self.uncertainty_samples = uncertainty_samples
+        # Fitted models hold their full history and can be several MB each, so
+        # only the most recently used stay in memory. With a model_dir, evicted
+        # models are already on disk and are hydrated again on next use.
+        self.models = _ModelCache(max_models, self._on_model_evicted)
+        # cachetools caches are not thread-safe, and even a get reorders the LRU;
+        # forecasts run on several executor threads, so every access takes this lock
+        self._models_lock = threading.Lock()
         self.performance_metrics = {}
+        # Listing metadata per model, maintained on write so listing never parses keys
+        self.model_meta = {}
+        # Training dates per model as int64 nanoseconds, for O(1) dedup on update
+        self._history_index = {}
+        
+        # Forecasts are fully determined by (model_key, horizon_days, include_components)
+        # until the model changes. LFU keeps hot SKUs resident under skewed traffic.
+        self._forecast_cache = LFUCache(maxsize=forecast_cache_size)
+        self._forecast_cache_lock = threading.Lock()
+    
+    def _on_model_evicted(self, model_key: ModelKey) -> None:
+        """Forget what cannot be recovered once a model leaves the in-memory cache."""
+        self._history_index.pop(model_key, None)
+        if self.model_dir:
+            return
+        
+        logger.warning(f"Evicted model {format_model_key(model_key)} without a model_dir; it must be retrained")
+        self.performance_metrics.pop(model_key, None)
+        self.model_meta.pop(model_key, None)
+        self._invalidate_forecasts(model_key)
+    
+    def _invalidate_forecasts(self, model_key: ModelKey) -> None:
+        """Drop cached forecasts for a model that was retrained, updated or deleted."""
+        with self._forecast_cache_lock:
+            for cache_key in [key for key in self._forecast_cache if key[0] == model_key]:
+                del self._forecast_cache[cache_key]
+    
+    def _record_model_meta(self, model_key: ModelKey, product_id: str,
+                           store_id: Optional[str]) -> None:
+        self.model_meta[model_key] = {
+            'product_id': product_id,
+            'store_id': store_id,
+            'model_key': format_model_key(model_key),
+            'has_performance_metrics': model_key in self.performance_metrics
+        }
+    
+    def _model_path(self, model_key: ModelKey) -> str:
+        return os.path.join(self.model_dir, f"{model_file_stem(model_key)}.json")
+    
+    def _save_model(self, model_key: ModelKey, data_hash: Optional[str] = None) -> None:
+        """Persist a trained model and its metrics so other workers can load it."""
+        if not self.model_dir:
+            return
+        
+        with self._models_lock:
+            model = self.models[model_key]
+        
+        os.makedirs(self.model_dir, exist_ok=True)
+        path = self._model_path(model_key)
+        # Other workers hydrate without the training lock, so write a temp file
+        # in the same directory and rename it over the old copy atomically
+        fd, tmp_path = tempfile.mkstemp(dir=self.model_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    'model': model_to_json(model),
+                    'performance_metrics': self.performance_metrics.get(model_key),
+                    'meta': self.model_meta.get(model_key),
+                    'data_hash': data_hash
+                }, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def _load_model_file(self, path: str) -> ModelKey:
+        """Register the model persisted at ``path`` and return its key."""
+        with open(path) as f:
+            data = json.load(f)
+        product_id, store_id = data['meta']['product_id'], data['meta']['store_id']
+        model_key = (product_id, store_id)
+        model = model_from_json(data['model'])
+        with self._models_lock:
+            self.models[model_key] = model
+        self._invalidate_forecasts(model_key)
+        self._history_index.pop(model_key, None)
+        if data.get('performance_metrics'):
+            self.performance_metrics[model_key] = data['performance_metrics']
+        self._record_model_meta(model_key, product_id, store_id)
+        return model_key
+    
+    def _load_if_unchanged(self, model_key: ModelKey, data_hash: str) -> bool:
+        """
+        Load the persisted model for ``model_key`` if it was fit on identical data.
+        
+        Returns:
+            True if the persisted model was loaded and a refit can be skipped
+        """
+        path = self._model_path(model_key)
+        if not os.path.exists(path):
+            return False
+        
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('data_hash') != data_hash or not data.get('performance_metrics'):
+                return False
+            model = model_from_json(data['model'])
+            with self._models_lock:
+                self.models[model_key] = model
+            self._invalidate_forecasts(model_key)
+            self._history_index.pop(model_key, None)
+            self.performance_metrics[model_key] = data['performance_metrics']
+            return True
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable persisted model for {format_model_key(model_key)}: {str(e)}")
+            return False
+    
+    def _hydrate(self, model_key: ModelKey) -> bool:
+        """Load a model another worker persisted after this one started."""
+        if not self.model_dir or not os.path.exists(self._model_path(model_key)):
+            return False
+        
+        try:
+            self._load_model_file(self._model_path(model_key))
+            with self._models_lock:
+                return model_key in self.models
+        except Exception as e:
+            logger.warning(f"Failed to load persisted model for {format_model_key(model_key)}: {str(e)}")
+            return False
+    
+    def _get_model(self, model_key: ModelKey) -> Optional[Prophet]:
+        """Get a model from memory, falling back to the persisted copy."""
+        with self._models_lock:
+            model = self.models.get(model_key)
+        if model is None and self._hydrate(model_key):
+            with self._models_lock:
+                model = self.models.get(model_key)
+        return model
+    
+    @contextmanager
+    def _training_lock(self, model_key: ModelKey):
+        """Serialize fits of one model across worker processes sharing ``model_dir``."""
+        if not self.model_dir:
+            yield
+            return
+        
+        os.makedirs(self.model_dir, exist_ok=True)
+        with open(f"{self._model_path(model_key)}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _data_hash(self, prophet_df: pd.DataFrame) -> str:
+        """Hash the training series together with the model configuration."""
+        digest = hashlib.sha256()
+        digest.update(prophet_df['ds'].to_numpy(dtype='datetime64[ns]').tobytes())
+        digest.update(prophet_df['y'].to_numpy(dtype=np.float64).tobytes())
+        digest.update(repr(sorted(self._model_params().items())).encode())
+        return digest.hexdigest()
+    
+    def load_models(self) -> int:
+        """
+        Load every persisted model from ``model_dir``.
         
-    def prepare_data_for_prophet(self, sales_data: pd.DataFrame) -> pd.DataFrame:
+        Returns:
+            Number of models loaded
+        """
+        if not self.model_dir or not os.path.isdir(self.model_dir):
+            return 0
+        
+        loaded = 0
+        for filename in os.listdir(self.model_dir):
+            if not filename.endswith('.json'):
+                continue
+            if loaded >= self.models.maxsize:
+                # The rest are hydrated on first use
+                break
+            
+            try:
+                self._load_model_file(os.path.join(self.model_dir, filename))
+                loaded += 1
+            except Exception as e:
+                logger.warning(f"Failed to load persisted model {filename}: {str(e)}")
+        
+        logger.info(f"Loaded {loaded} persisted Prophet models from {self.model_dir}")
+        return loaded
+        
+    @staticmethod
+    def prepare_data_for_prophet(sales_data: SalesData) -> pd.DataFrame:
         """
         Prepare sales data for Prophet format (ds, y).
         
         Args:
-            sales_data: DataFrame with columns: date, quantity_sold
+            sales_data: DataFrame with columns: date, quantity_sold, or a
+                (dates, quantities) tuple of NumPy arrays
             
         Returns:
             DataFrame in Prophet format with columns: ds, y
         """
-        df = sales_data.copy()
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date')
+        if isinstance(sales_data, tuple):
+            dates, quantities = sales_data
+        else:
+            # Dates are ISO strings or already datetime64; the format hint skips
+            # per-value format inference and the cache parses repeated dates once
+            dates = pd.to_datetime(
+                sales_data['date'].to_numpy(), format='ISO8601', cache=True, errors='coerce'
+            ).to_numpy()
+            quantities = sales_data['quantity_sold'].to_numpy(dtype=np.float64)
         
-        # Prophet expects 'ds' for dates and 'y' for values
-        prophet_df = pd.DataFrame({
-            'ds': df['date'],
-            'y': df['quantity_sold']
-        })
+        # Drop missing rows, sort by date and clip negatives on the raw arrays,
+        # then build the Prophet frame (ds, y) once without copying
+        dates = np.asarray(dates, dtype='datetime64[ns]')
+        quantities = np.asarray(quantities, dtype=np.float64)
+        valid = np.flatnonzero(~(np.isnat(dates) | np.isnan(quantities)))
+        order = valid[np.argsort(dates[valid], kind='stable')]
+        prophet_df = pd.DataFrame(
+            {'ds': dates[order], 'y': np.maximum(quantities[order], 0.0)},
+            copy=False
+        )
         
-        # Remove rows with NaN values
-        prophet_df = prophet_df.dropna()
+        return prophet_df
+    
+    def warmup(self) -> None:
+        """
+        Fit and predict a tiny synthetic series once.
         
-        # Ensure y values are non-negative
-        prophet_df['y'] = np.maximum(prophet_df['y'], 0)
+        Pays Prophet's import chain, Stan model load and holiday setup at worker
+        startup instead of on the first user request. Nothing is stored.
+        """
+        ds = pd.date_range(end=datetime.now().date(), periods=60, freq='D')
+        warmup_df = pd.DataFrame({'ds': ds, 'y': 10.0 + (np.arange(60) % 7)})
         
-        return prophet_df
+        model = _build_model(self._model_params(), len(ds) - 1)
+        model.fit(warmup_df)
+        model.predict(pd.DataFrame({'ds': ds[-7:]}))
+        logger.info("Prophet warmup completed")
     
-    def train(self, sales_data: pd.DataFrame, product_id: str, 
+    def train(self, sales_data: SalesData, product_id: str, 
               store_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Train Prophet forecasting model for a specific product/store combination.
@@ -80,88 +487,136 @@ class ProphetForecaster:
             if len(prophet_df) < 30:
                 raise ValueError(f"Insufficient data for product {product_id}. Need at least 30 days.")
             
-            # Create and configure Prophet model
-            model = Prophet(
-                seasonality_mode=self.seasonality_mode,
-                changepoint_prior_scale=self.changepoint_prior_scale,
-                seasonality_prior_scale=self.seasonality_prior_scale,
-                daily_seasonality=False,
-                weekly_seasonality=True,
-                yearly_seasonality=True,
-                interval_width=self.confidence_level
-            )
-            
-            # Add custom seasonalities for retail
-            model.add_seasonality(
-                name='monthly', 
-                period=30.5, 
-                fourier_order=5
-            )
-            model.add_seasonality(
-                name='quarterly', 
-                period=91.25, 
-                fourier_order=8
-            )
-            
-            # Add holiday effects for major retail periods
-            model.add_country_holidays(country_name='US')
-            
-            # Fit the model
-            model.fit(prophet_df)
-            
-            # Store the model
-            model_key = f"{product_id}_{store_id}" if store_id else product_id
-            self.models[model_key] = model
-            
-            # Perform cross-validation for performance metrics
-            cv_results = cross_validation(
-                model, 
-                initial='90 days', 
-                period='30 days', 
-                horizon='30 days',
-                disable_tqdm=True
-            )
-            
-            # Calculate performance metrics
-            perf_metrics = performance_metrics(cv_results)
-            
-            # Store performance metrics
-            self.performance_metrics[model_key] = {
-                'mae': perf_metrics['mae'].mean(),
-                'mape': perf_metrics['mape'].mean(),
-                'rmse': perf_metrics['rmse'].mean(),
-                'mdape': perf_metrics['mdape'].mean(),
-                'smape': perf_metrics['smape'].mean(),
-                'coverage': perf_metrics['coverage'].mean()
-            }
-            
-            results = {
-                'product_id': product_id,
-                'store_id': store_id,
-                'training_samples': len(prophet_df),
-                'date_range': {
-                    'start': prophet_df['ds'].min().strftime('%Y-%m-%d'),
-                    'end': prophet_df['ds'].max().strftime('%Y-%m-%d')
-                },
-                'performance_metrics': self.performance_metrics[model_key],
-                'model_config': {
-                    'seasonality_mode': self.seasonality_mode,
-                    'confidence_level': self.confidence_level,
-                    'changepoint_prior_scale': self.changepoint_prior_scale,
-                    'seasonality_prior_scale': self.seasonality_prior_scale
-                }
-            }
-            
-            logger.info(f"Prophet model trained successfully for {model_key}. MAE: {results['performance_metrics']['mae']:.2f}")
-            return results
+            model_key = (product_id, store_id or None)
+            data_hash = self._data_hash(prophet_df)
+            
+            # Hold the per-model lock so concurrent workers fit a series once and
+            # the rest pick up the persisted result
+            with self._training_lock(model_key):
+                if self.model_dir and self._load_if_unchanged(model_key, data_hash):
+                    logger.info(f"Reusing persisted model for {format_model_key(model_key)}; training data unchanged")
+                    self._record_model_meta(model_key, product_id, store_id)
+                    return self._training_results(model_key, product_id, store_id, prophet_df)
+                
+                # Fit the model and cross-validate it
+                _, model, metrics = _train_one(model_key, prophet_df, self._model_params(), self.cv_parallel)
+                
+                # Store the model and performance metrics
+                self._store_model(model_key, product_id, store_id, model, metrics, data_hash)
+            
+            return self._training_results(model_key, product_id, store_id, prophet_df)
             
         except Exception as e:
             logger.error(f"Error training Prophet model for product {product_id}: {str(e)}")
             raise
     
+    def train_many(self, sales_by_key: Dict[ModelKey, SalesData],
+                   n_jobs: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Train models for many product/store combinations in parallel processes.
+        
+        Each fit is CPU-bound and independent, so SKUs are spread across a loky
+        process pool. Cross-validation runs serially inside each worker to avoid
+        nested parallelism.
+        
+        Args:
+            sales_by_key: Historical sales data keyed by (product_id, store_id)
+            n_jobs: Worker processes (defaults to half the CPUs, since each fit
+                also drives a Stan process)
+            
+        Returns:
+            Training results or error per formatted model key
+        """
+        results = {}
+        tasks = []
+        
+        for model_key, sales_data in sales_by_key.items():
+            product_id, store_id = model_key
+            model_key = (product_id, store_id or None)
+            prophet_df = self.prepare_data_for_prophet(sales_data)
+            if len(prophet_df) < 30:
+                results[format_model_key(model_key)] = {
+                    'error': f"Insufficient data for product {product_id}. Need at least 30 days."
+                }
+                continue
+            data_hash = self._data_hash(prophet_df)
+            if self.model_dir and self._load_if_unchanged(model_key, data_hash):
+                self._record_model_meta(model_key, product_id, store_id)
+                results[format_model_key(model_key)] = self._training_results(
+                    model_key, product_id, store_id, prophet_df
+                )
+                continue
+            tasks.append((model_key, prophet_df, data_hash))
+        
+        n_jobs = n_jobs or max(1, (os.cpu_count() or 2) // 2)
+        model_params = self._model_params()
+        trained = Parallel(n_jobs=n_jobs, backend='loky', batch_size='auto')(
+            delayed(_try_train_one)(model_key, prophet_df, model_params)
+            for model_key, prophet_df, _ in tasks
+        )
+        
+        for (model_key, prophet_df, data_hash), (_, model, outcome) in zip(tasks, trained):
+            product_id, store_id = model_key
+            if model is None:
+                logger.error(f"Error training Prophet model for {format_model_key(model_key)}: {outcome}")
+                results[format_model_key(model_key)] = {'error': outcome}
+                continue
+            self._store_model(model_key, product_id, store_id, model, outcome, data_hash)
+            results[format_model_key(model_key)] = self._training_results(
+                model_key, product_id, store_id, prophet_df
+            )
+        
+        logger.info(f"Trained {len(trained)} Prophet models across {n_jobs} processes")
+        return results
+    
+    def _model_params(self) -> Dict[str, Any]:
+        """Model configuration passed to _train_one."""
+        return {
+            'seasonality_mode': self.seasonality_mode,
+            'changepoint_prior_scale': self.changepoint_prior_scale,
+            'seasonality_prior_scale': self.seasonality_prior_scale,
+            'confidence_level': self.confidence_level,
+            'uncertainty_samples': self.uncertainty_samples
+        }
+    
+    def _store_model(self, model_key: ModelKey, product_id: str, store_id: Optional[str],
+                     model: Prophet, metrics: Dict[str, float],
+                     data_hash: Optional[str] = None) -> None:
+        """Register a freshly trained model, replacing any cached forecasts and persisted copy."""
+        with self._models_lock:
+            self.models[model_key] = model
+        self._invalidate_forecasts(model_key)
+        self._history_index.pop(model_key, None)
+        self.performance_metrics[model_key] = metrics
+        self._record_model_meta(model_key, product_id, store_id)
+        self._save_model(model_key, data_hash)
+    
+    def _training_results(self, model_key: ModelKey, product_id: str, store_id: Optional[str],
+                          prophet_df: pd.DataFrame) -> Dict[str, Any]:
+        """Summarize a training run."""
+        results = {
+            'product_id': product_id,
+            'store_id': store_id,
+            'training_samples': len(prophet_df),
+            'date_range': {
+                'start': prophet_df['ds'].min().strftime('%Y-%m-%d'),
+                'end': prophet_df['ds'].max().strftime('%Y-%m-%d')
+            },
+            'performance_metrics': self.performance_metrics[model_key],
+            'model_config': {
+                'seasonality_mode': self.seasonality_mode,
+                'confidence_level': self.confidence_level,
+                'changepoint_prior_scale': self.changepoint_prior_scale,
+                'seasonality_prior_scale': self.seasonality_prior_scale
+            }
+        }
+        
+        logger.info(f"Prophet model trained successfully for {format_model_key(model_key)}. MAE: {results['performance_metrics']['mae']:.2f}")
+        return results
+    
     def forecast(self, product_id: str, horizon_days: int, 
                  store_id: Optional[str] = None,
-                 include_components: bool = True) -> Dict[str, Any]:
+                 include_components: bool = False) -> Dict[str, Any]:
         """
         Generate probabilistic forecast with P50/P90 quantiles.
         
@@ -174,24 +629,22 @@ class ProphetForecaster:
         Returns:
             Forecast results with P50/P90 quantiles and confidence intervals
         """
-        model_key = f"{product_id}_{store_id}" if store_id else product_id
+        model_key = (product_id, store_id or None)
         
-        if model_key not in self.models:
-            raise ValueError(f"No trained model found for {model_key}")
+        cache_key = (model_key, horizon_days, include_components)
+        with self._forecast_cache_lock:
+            cached = self._forecast_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        model = self._get_model(model_key)
+        if model is None:
+            raise ValueError(f"No trained model found for {format_model_key(model_key)}")
         
         try:
-            model = self.models[model_key]
-            
-            # Generate future dates
-            last_date = model.history['ds'].max()
-            future_dates = pd.date_range(
-                start=last_date + timedelta(days=1),
-                periods=horizon_days,
-                freq='D'
-            )
             
-            # Create future dataframe
-            future_df = pd.DataFrame({'ds': future_dates})
+            # Future dates only, built from the history dates the model already holds
+            future_df = model.make_future_dataframe(periods=horizon_days, freq='D', include_history=False)
             
             # Generate forecast
             forecast = model.predict(future_df)
@@ -200,65 +653,121 @@ class ProphetForecaster:
             forecast_results = {
                 'product_id': product_id,
                 'store_id': store_id,
-                'forecast_dates': future_dates.strftime('%Y-%m-%d').tolist(),
+                'forecast_dates': np.datetime_as_string(future_df['ds'].to_numpy(), unit='D').tolist(),
                 'forecast_horizon_days': horizon_days,
                 'confidence_level': self.confidence_level,
                 'model_version': '2.0.0-prophet',
                 'generated_at': datetime.now().isoformat()
             }
             
-            # Extract quantiles and confidence intervals
+            # Extract quantiles and confidence intervals as arrays; orjson serializes
+            # them natively, so no per-element Python lists are built
             if 'yhat' in forecast.columns:
-                forecast_results['p50_forecast'] = forecast['yhat'].tolist()
-                forecast_results['p50_forecast_rounded'] = np.round(forecast['yhat']).astype(int).tolist()
+                yhat = forecast['yhat'].to_numpy()
+                forecast_results['p50_forecast'] = _forecast_array(yhat)
+                forecast_results['p50_forecast_rounded'] = _forecast_array(_round_to_int(yhat))
             
             if 'yhat_lower' in forecast.columns:
-                forecast_results['p05_forecast'] = forecast['yhat_lower'].tolist()
-                forecast_results['p05_forecast_rounded'] = np.round(forecast['yhat_lower']).astype(int).tolist()
+                yhat_lower = forecast['yhat_lower'].to_numpy()
+                forecast_results['p05_forecast'] = _forecast_array(yhat_lower)
+                forecast_results['p05_forecast_rounded'] = _forecast_array(_round_to_int(yhat_lower))
             
             if 'yhat_upper' in forecast.columns:
-                forecast_results['p95_forecast'] = forecast['yhat_upper'].tolist()
-                forecast_results['p95_forecast_rounded'] = np.round(forecast['yhat_upper']).astype(int).tolist()
+                yhat_upper = forecast['yhat_upper'].to_numpy()
+                forecast_results['p95_forecast'] = _forecast_array(yhat_upper)
+                forecast_results['p95_forecast_rounded'] = _forecast_array(_round_to_int(yhat_upper))
             
             # Calculate P90 (90th percentile) for reorder point calculations
             if 'yhat' in forecast.columns and 'yhat_lower' in forecast.columns and 'yhat_upper' in forecast.columns:
-                # P90 is approximately 1.28 standard deviations above P50
-                # Using the confidence interval to estimate standard deviation
-                std_estimate = (forecast['yhat_upper'] - forecast['yhat_lower']) / (2 * 1.96)  # 95% CI = ±1.96σ
-                p90_forecast = forecast['yhat'] + (1.28 * std_estimate)
-                forecast_results['p90_forecast'] = p90_forecast.tolist()
-                forecast_results['p90_forecast_rounded'] = np.round(p90_forecast).astype(int).tolist()
+                # P90 is approximately 1.28 standard deviations above P50, with the
+                # standard deviation estimated from the 95% interval (±1.96σ).
+                # Computed in place in one output buffer, without temporaries.
+                p90_forecast = np.subtract(yhat_upper, yhat_lower)
+                p90_forecast *= 1.28 / (2 * 1.96)
+                p90_forecast += yhat
+                forecast_results['p90_forecast'] = _forecast_array(p90_forecast)
+                forecast_results['p90_forecast_rounded'] = _forecast_array(_round_to_int(p90_forecast))
             
             # Include trend and seasonality components if requested
             if include_components:
                 if 'trend' in forecast.columns:
-                    forecast_results['trend'] = forecast['trend'].tolist()
+                    forecast_results['trend'] = _forecast_array(forecast['trend'].to_numpy())
                 if 'weekly' in forecast.columns:
-                    forecast_results['weekly_seasonality'] = forecast['weekly'].tolist()
+                    forecast_results['weekly_seasonality'] = _forecast_array(forecast['weekly'].to_numpy())
                 if 'yearly' in forecast.columns:
-                    forecast_results['yearly_seasonality'] = forecast['yearly'].tolist()
+                    forecast_results['yearly_seasonality'] = _forecast_array(forecast['yearly'].to_numpy())
             
             # Add performance metrics if available
             if model_key in self.performance_metrics:
                 forecast_results['model_performance'] = self.performance_metrics[model_key]
             
-            logger.info(f"Prophet forecast generated for {model_key}, horizon: {horizon_days} days")
+            with self._forecast_cache_lock:
+                self._forecast_cache[cache_key] = forecast_results
+            
+            logger.info(f"Prophet forecast generated for {format_model_key(model_key)}, horizon: {horizon_days} days")
             return forecast_results
             
         except Exception as e:
-            logger.error(f"Error generating forecast for {model_key}: {str(e)}")
+            logger.error(f"Error generating forecast for {format_model_key(model_key)}: {str(e)}")
             raise
     
+    def forecast_components(self, product_id: str, horizon_days: int,
+                            store_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the trend and seasonality breakdown of a forecast, for plotting.
+        
+        Args:
+            product_id: Product identifier
+            horizon_days: Number of days to forecast
+            store_id: Store identifier (optional)
+            
+        Returns:
+            Forecast dates with trend, weekly and yearly components
+        """
+        forecast_results = self.forecast(product_id, horizon_days, store_id, include_components=True)
+        
+        return {
+            key: forecast_results[key]
+            for key in ('product_id', 'store_id', 'forecast_dates',
+                        'trend', 'weekly_seasonality', 'yearly_seasonality')
+            if key in forecast_results
+        }
+    
+    def has_model(self, product_id: str, store_id: Optional[str] = None) -> bool:
+        """Check for a trained model, loading it from ``model_dir`` if another worker trained it."""
+        model_key = (product_id, store_id or None)
+        with self._models_lock:
+            if model_key in self.models:
+                return True
+        return self._hydrate(model_key)
+    
     def get_model_performance(self, product_id: str, store_id: Optional[str] = None) -> Dict[str, Any]:
         """Get performance metrics for a trained model."""
-        model_key = f"{product_id}_{store_id}" if store_id else product_id
+        model_key = (product_id, store_id or None)
         
         if model_key not in self.performance_metrics:
-            raise ValueError(f"No performance metrics found for {model_key}")
+            raise ValueError(f"No performance metrics found for {format_model_key(model_key)}")
         
         return self.performance_metrics[model_key]
     
-    def update_model(self, product_id: str, new_sales_data: pd.DataFrame, 
+    def delete_model(self, product_id: str, store_id: Optional[str] = None) -> None:
+        """Remove a trained model along with its metrics and cached forecasts."""
+        model_key = (product_id, store_id or None)
+        
+        if not self.has_model(product_id, store_id):
+            raise ValueError(f"No trained model found for {format_model_key(model_key)}")
+        
+        with self._models_lock:
+            self.models.pop(model_key, None)
+        self.performance_metrics.pop(model_key, None)
+        self.model_meta.pop(model_key, None)
+        self._history_index.pop(model_key, None)
+        self._invalidate_forecasts(model_key)
+        
+        if self.model_dir and os.path.exists(self._model_path(model_key)):
+            os.remove(self._model_path(model_key))
+    
+    def update_model(self, product_id: str, new_sales_data: SalesData, 
                      store_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Update existing model with new data.
@@ -271,65 +780,176 @@ class ProphetForecaster:
         Returns:
             Update results
         """
-        model_key = f"{product_id}_{store_id}" if store_id else product_id
+        model_key = (product_id, store_id or None)
         
-        if model_key not in self.models:
-            raise ValueError(f"No existing model found for {model_key}")
+        if not self.has_model(product_id, store_id):
+            raise ValueError(f"No existing model found for {format_model_key(model_key)}")
         
         try:
             # Prepare new data
             new_prophet_df = self.prepare_data_for_prophet(new_sales_data)
             
-            # Get existing model
-            model = self.models[model_key]
-            
-            # Add new data and refit
-            model.history = pd.concat([model.history, new_prophet_df]).drop_duplicates(subset=['ds'])
-            model.fit(model.history)
-            
-            # Update performance metrics
-            cv_results = cross_validation(
-                model, 
-                initial='90 days', 
-                period='30 days', 
-                horizon='30 days',
-                disable_tqdm=True
-            )
-            
-            perf_metrics = performance_metrics(cv_results)
-            self.performance_metrics[model_key] = {
-                'mae': perf_metrics['mae'].mean(),
-                'mape': perf_metrics['mape'].mean(),
-                'rmse': perf_metrics['rmse'].mean(),
-                'mdape': perf_metrics['mdape'].mean(),
-                'smape': perf_metrics['smape'].mean(),
-                'coverage': perf_metrics['coverage'].mean()
-            }
+            # Get existing training history
+            history = self._get_model(model_key).history[['ds', 'y']]
+            history_index = self._history_index.get(model_key)
+            if history_index is None:
+                history_index = set(history['ds'].to_numpy(dtype='datetime64[ns]').view('i8').tolist())
+            
+            # Keep only dates not already in the history; set lookups make this
+            # O(new rows) instead of re-sorting the full history to deduplicate
+            new_index = set()
+            keep = []
+            new_ds = new_prophet_df['ds'].to_numpy(dtype='datetime64[ns]').view('i8').tolist()
+            for i, ts in enumerate(new_ds):
+                if ts not in history_index and ts not in new_index:
+                    new_index.add(ts)
+                    keep.append(i)
+            history = pd.concat([history, new_prophet_df.iloc[keep]], ignore_index=True)
+            
+            # Prophet models can only be fit once, so refit a fresh model on the
+            # extended history and update performance metrics
+            _, model, metrics = _train_one(model_key, history, self._model_params(), self.cv_parallel)
+            self._store_model(model_key, product_id, store_id, model, metrics)
+            self._history_index[model_key] = history_index | new_index
             
             results = {
                 'product_id': product_id,
                 'store_id': store_id,
                 'update_samples': len(new_prophet_df),
-                'total_samples': len(model.history),
+                'total_samples': len(history),
                 'updated_at': datetime.now().isoformat(),
                 'performance_metrics': self.performance_metrics[model_key]
             }
             
-            logger.info(f"Model updated successfully for {model_key}")
+            logger.info(f"Model updated successfully for {format_model_key(model_key)}")
             return results
             
         except Exception as e:
-            logger.error(f"Error updating model for {model_key}: {str(e)}")
+            logger.error(f"Error updating model for {format_model_key(model_key)}: {str(e)}")
             raise
 
 
+class NeuralProphetForecaster:
+    """
+    Demand forecaster backed by NeuralProphet for low-latency prediction.
+    
+    NeuralProphet predicts the whole horizon in one vectorized forward pass
+    instead of Prophet's Monte Carlo uncertainty sampling, so it is used to
+    serve forecasts while Prophet remains the reference model. NeuralProphet is
+    an optional dependency (``pip install neuralprophet``) imported on first use.
+    """
+    
+    # Quantiles fitted alongside the median: P05/P95 interval and P90 for reorders
+    QUANTILES = [0.05, 0.9, 0.95]
+    
+    def __init__(self, epochs: Optional[int] = None):
+        self.epochs = epochs
+        self.models = {}
+        # Training frames per model, needed to build future dataframes
+        self.histories = {}
+    
+    def has_model(self, product_id: str, store_id: Optional[str] = None) -> bool:
+        """Check for a trained model."""
+        return (product_id, store_id or None) in self.models
+    
+    def train(self, sales_data: SalesData, product_id: str,
+              store_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Train a NeuralProphet model for a specific product/store combination.
+        
+        Args:
+            sales_data: Historical sales data
+            product_id: Product identifier
+            store_id: Store identifier (optional)
+            
+        Returns:
+            Training results
+        """
+        try:
+            from neuralprophet import NeuralProphet
+        except ImportError as e:
+            raise RuntimeError("NeuralProphet is not installed; install neuralprophet to use this backend") from e
+        
+        prophet_df = ProphetForecaster.prepare_data_for_prophet(sales_data)
+        if len(prophet_df) < 30:
+            raise ValueError(f"Insufficient data for product {product_id}. Need at least 30 days.")
+        
+        model = NeuralProphet(
+            weekly_seasonality=True,
+            yearly_seasonality=True,
+            daily_seasonality=False,
+            quantiles=self.QUANTILES,
+            epochs=self.epochs
+        )
+        model.fit(prophet_df, freq='D')
+        
+        model_key = (product_id, store_id or None)
+        self.models[model_key] = model
+        self.histories[model_key] = prophet_df
+        
+        logger.info(f"NeuralProphet model trained successfully for {format_model_key(model_key)}")
+        return {
+            'product_id': product_id,
+            'store_id': store_id,
+            'training_samples': len(prophet_df),
+            'quantiles': self.QUANTILES
+        }
+    
+    def forecast(self, product_id: str, horizon_days: int,
+                 store_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate a forecast with the same P50/P90 fields as ProphetForecaster.forecast.
+        
+        Args:
+            product_id: Product identifier
+            horizon_days: Number of days to forecast
+            store_id: Store identifier (optional)
+            
+        Returns:
+            Forecast results with P50/P90 quantiles and confidence intervals
+        """
+        model_key = (product_id, store_id or None)
+        
+        if model_key not in self.models:
+            raise ValueError(f"No trained NeuralProphet model found for {format_model_key(model_key)}")
+        
+        model = self.models[model_key]
+        future_df = model.make_future_dataframe(self.histories[model_key], periods=horizon_days)
+        forecast = model.predict(future_df)
+        
+        forecast_results = {
+            'product_id': product_id,
+            'store_id': store_id,
+            'forecast_dates': forecast['ds'].dt.strftime('%Y-%m-%d').tolist(),
+            'forecast_horizon_days': horizon_days,
+            'confidence_level': self.QUANTILES[-1] - self.QUANTILES[0],
+            'model_version': '2.0.0-neuralprophet',
+            'generated_at': datetime.now().isoformat()
+        }
+        
+        # NeuralProphet names quantile columns "yhat1 <q>%"
+        for field, column in (('p50_forecast', 'yhat1'),
+                              ('p05_forecast', 'yhat1 5.0%'),
+                              ('p90_forecast', 'yhat1 90.0%'),
+                              ('p95_forecast', 'yhat1 95.0%')):
+            values = forecast[column].to_numpy(dtype=np.float64)
+            forecast_results[field] = _forecast_array(values)
+            forecast_results[f'{field}_rounded'] = _forecast_array(_round_to_int(values))
+        
+        logger.info(f"NeuralProphet forecast generated for {format_model_key(model_key)}, horizon: {horizon_days} days")
+        return forecast_results
+
+
 class EnsembleForecaster:
     """
     Ensemble forecaster combining multiple models for improved accuracy.
     """
     
-    def __init__(self):
-        self.prophet_forecaster = ProphetForecaster()
+    def __init__(self, prophet_forecaster: Optional[ProphetForecaster] = None,
+                 neural_forecaster: Optional[NeuralProphetForecaster] = None):
+        self.prophet_forecaster = prophet_forecaster or ProphetForecaster()
+        # Optional NeuralProphet backend; serves forecasts when it has a model
+        self.neural_forecaster = neural_forecaster
         self.models = {}
     
     def train_ensemble(self, sales_data: pd.DataFrame, product_id: str, 
@@ -345,15 +965,31 @@ class EnsembleForecaster:
             logger.warning(f"Prophet training failed: {e}")
             results['prophet'] = {'error': str(e)}
         
+        # Train NeuralProphet model for low-latency serving
+        if self.neural_forecaster is not None:
+            try:
+                results['neuralprophet'] = self.neural_forecaster.train(sales_data, product_id, store_id)
+            except Exception as e:
+                logger.warning(f"NeuralProphet training failed: {e}")
+                results['neuralprophet'] = {'error': str(e)}
+        
         return results
     
     def forecast_ensemble(self, product_id: str, horizon_days: int, 
                          store_id: Optional[str] = None) -> Dict[str, Any]:
         """Generate ensemble forecast."""
-        model_key = f"{product_id}_{store_id}" if store_id else product_id
+        model_key = (product_id, store_id or None)
+        
+        # Prefer NeuralProphet when it has a model: its predict is much faster
+        if self.neural_forecaster is not None and self.neural_forecaster.has_model(product_id, store_id):
+            return {
+                'ensemble_forecast': self.neural_forecaster.forecast(product_id, horizon_days, store_id),
+                'primary_model': 'neuralprophet',
+                'ensemble_method': 'single_model'
+            }
         
-        if model_key not in self.prophet_forecaster.models:
-            raise ValueError(f"No trained models found for {model_key}")
+        if not self.prophet_forecaster.has_model(product_id, store_id):
+            raise ValueError(f"No trained models found for {format_model_key(model_key)}")
         
         # Get Prophet forecast
         prophet_forecast = self.prophet_forecaster.forecast(
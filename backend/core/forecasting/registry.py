@@ -0,0 +1,111 @@
+"""
+Shared forecasting and reorder engine instances.
+
+Every router must use these accessors so that models trained through one
+endpoint are visible to all others within the worker process.
+
+The forecasters are created on first use: importing Prophet (and pandas with
+it) costs about a second and a few hundred MB per worker, which workers that
+never serve forecasting traffic should not pay.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+
+from core.config import settings
+from core.optimization.reorder_engine import ReorderPointEngine
+
+if TYPE_CHECKING:
+    from core.forecasting.client import RemoteForecaster
+    from core.forecasting.models import ProphetForecaster, EnsembleForecaster
+
+_prophet_forecaster: Optional["ProphetForecaster"] = None
+_ensemble_forecaster: Optional["EnsembleForecaster"] = None
+_remote_forecaster: Optional["RemoteForecaster"] = None
+_forecaster_lock = threading.Lock()
+_reorder_engine = ReorderPointEngine()
+
+# Dedicated pool for CPU-bound forecasting so Prophet work cannot starve the
+# default threadpool that serves auth and other sync request work. Threads
+# (not processes) because the trained models live in this process.
+_forecast_executor = ThreadPoolExecutor(
+    max_workers=settings.FORECAST_MAX_WORKERS,
+    thread_name_prefix="forecast"
+)
+
+
+def _init_forecasters() -> None:
+    """Import the forecasting stack and create the shared forecasters."""
+    global _prophet_forecaster, _ensemble_forecaster
+    
+    with _forecaster_lock:
+        if _prophet_forecaster is not None:
+            return
+        from core.forecasting.models import (
+            ProphetForecaster, NeuralProphetForecaster, EnsembleForecaster
+        )
+        
+        prophet_forecaster = ProphetForecaster(
+            model_dir=settings.FORECAST_MODEL_DIR,
+            cv_parallel=settings.FORECAST_CV_PARALLEL,
+            uncertainty_samples=settings.FORECAST_UNCERTAINTY_SAMPLES,
+            max_models=settings.MODEL_CACHE_SIZE
+        )
+        neural_forecaster = NeuralProphetForecaster() if settings.FORECAST_NEURALPROPHET else None
+        _ensemble_forecaster = EnsembleForecaster(prophet_forecaster, neural_forecaster)
+        _prophet_forecaster = prophet_forecaster
+
+
+def get_forecaster() -> "ProphetForecaster":
+    """Get the process-wide Prophet forecaster, creating it on first use."""
+    if _prophet_forecaster is None:
+        _init_forecasters()
+    return _prophet_forecaster
+
+
+def get_ensemble_forecaster() -> "EnsembleForecaster":
+    """Get the process-wide ensemble forecaster (backed by the shared Prophet forecaster)."""
+    if _prophet_forecaster is None:
+        _init_forecasters()
+    return _ensemble_forecaster
+
+
+def get_reorder_forecaster() -> Union["ProphetForecaster", "RemoteForecaster"]:
+    """
+    Get the forecaster that serves reorder calculations.
+    
+    With FORECAST_SERVICE_URL set, forecasts come from the separate forecasting
+    service and this worker never imports Prophet; otherwise the local forecaster.
+    """
+    global _remote_forecaster
+    
+    if not settings.FORECAST_SERVICE_URL:
+        return get_forecaster()
+    
+    if _remote_forecaster is None:
+        with _forecaster_lock:
+            if _remote_forecaster is None:
+                from core.forecasting.client import RemoteForecaster
+                _remote_forecaster = RemoteForecaster(
+                    settings.FORECAST_SERVICE_URL, timeout=settings.FORECAST_SERVICE_TIMEOUT
+                )
+    return _remote_forecaster
+
+
+def get_reorder_engine() -> ReorderPointEngine:
+    """Get the process-wide reorder point engine."""
+    return _reorder_engine
+
+
+def get_forecast_executor() -> ThreadPoolExecutor:
+    """Get the executor used for CPU-bound forecasting work."""
+    return _forecast_executor
+
+
+async def run_forecast_task(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking forecasting call on the forecast executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_forecast_executor, functools.partial(func, *args, **kwargs))
@@ -2,15 +2,31 @@
 Reorder point calculation engine using P90 forecasts and lead time distributions.
 """
 
-import pandas as pd
+import math
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Union
 from datetime import datetime, timedelta
 import logging
 from dataclasses import dataclass
+from statistics import NormalDist
 
 logger = logging.getLogger(__name__)
 
+# Z-scores for service levels 0.001..0.999 in 0.001 steps, indexed by
+# round(service_level * 1000); computed once so requests never evaluate the
+# inverse normal CDF
+Z_TABLE = np.array([0.0] + [NormalDist().inv_cdf(i / 1000) for i in range(1, 1000)])
+
+
+def z_score_for(service_level: float) -> float:
+    """Look up the z-score for a service level, clamped to 0.001..0.999."""
+    return float(Z_TABLE[min(max(round(service_level * 1000), 1), 999)])
+
+# Urgency levels ordered from most to least urgent; array results encode urgency
+# as an index into this tuple
+URGENCY_LEVELS = ('critical', 'high', 'medium', 'low')
+URGENCY_CODES = {urgency: code for code, urgency in enumerate(URGENCY_LEVELS)}
+
 
 @dataclass
 class ReorderPointConfig:
@@ -70,27 +86,31 @@ class ReorderPointEngine:
         if len(daily_forecasts) < lead_time_days:
             raise ValueError(f"Insufficient forecast data. Need at least {lead_time_days} days.")
         
-        # Take the first lead_time_days forecasts
-        lt_forecasts = daily_forecasts[:lead_time_days]
+        # Take the first lead_time_days forecasts, converted to an array once
+        lt_forecasts = np.asarray(daily_forecasts[:lead_time_days], dtype=np.float64)
         
         # Calculate P50 (mean) and P90 demand during lead time
-        p50_demand = np.mean(lt_forecasts)
-        p90_demand = np.percentile(lt_forecasts, 90)
+        total_demand = float(lt_forecasts.sum())
+        p50_demand = total_demand / len(lt_forecasts)
+        p90_demand = float(np.percentile(lt_forecasts, 90))
         
-        # Calculate standard deviation for safety stock
-        std_demand = np.std(lt_forecasts)
+        # Calculate standard deviation for safety stock, reusing the mean
+        deviations = lt_forecasts - p50_demand
+        std_demand = math.sqrt(float(np.dot(deviations, deviations)) / len(lt_forecasts))
         
         return {
             'p50_demand': p50_demand,
             'p90_demand': p90_demand,
             'std_demand': std_demand,
-            'total_demand': sum(lt_forecasts)
+            'total_demand': total_demand
         }
     
     def calculate_safety_stock(self, 
                               std_demand: float,
                               lead_time_std: float,
-                              service_level: float) -> float:
+                              service_level: float,
+                              demand_during_lt: float = 0.0,
+                              lead_time_days: Optional[int] = None) -> float:
         """
         Calculate safety stock using demand and lead time variability.
         
@@ -98,18 +118,21 @@ class ReorderPointEngine:
             std_demand: Standard deviation of daily demand
             lead_time_std: Standard deviation of lead time
             service_level: Desired service level (e.g., 0.95 for 95%)
+            demand_during_lt: Expected demand during lead time
+            lead_time_days: Lead time in days (defaults to the engine configuration)
             
         Returns:
             Safety stock quantity
         """
+        lead_time_days = lead_time_days or self.config.lead_time_days
+        
         # Z-score for service level
-        z_scores = {0.90: 1.28, 0.95: 1.645, 0.99: 2.326}
-        z_score = z_scores.get(service_level, 1.645)
+        z_score = z_score_for(service_level)
         
         # Safety stock formula: Z * sqrt(lead_time * std_demand^2 + demand^2 * std_lead_time^2)
-        safety_stock = z_score * np.sqrt(
-            self.config.lead_time_days * std_demand**2 + 
-            (self.config.demand_during_lt or 0)**2 * lead_time_std**2
+        safety_stock = z_score * math.sqrt(
+            lead_time_days * std_demand**2 + 
+            demand_during_lt**2 * lead_time_std**2
         )
         
         return max(0, safety_stock)
@@ -117,7 +140,8 @@ class ReorderPointEngine:
     def calculate_reorder_point(self, 
                               demand_during_lt: float,
                               safety_stock: float,
-                              review_period_days: int = 1) -> int:
+                              review_period_days: int = 1,
+                              lead_time_days: Optional[int] = None) -> int:
         """
         Calculate reorder point.
         
@@ -125,12 +149,15 @@ class ReorderPointEngine:
             demand_during_lt: Expected demand during lead time
             safety_stock: Safety stock quantity
             review_period_days: Review period in days
+            lead_time_days: Lead time in days (defaults to the engine configuration)
             
         Returns:
             Reorder point quantity
         """
+        lead_time_days = lead_time_days or self.config.lead_time_days
+        
         # Reorder point = demand during lead time + safety stock + review period demand
-        review_demand = demand_during_lt * (review_period_days / self.config.lead_time_days)
+        review_demand = demand_during_lt * (review_period_days / lead_time_days)
         reorder_point = demand_during_lt + safety_stock + review_demand
         
         return max(0, int(np.ceil(reorder_point)))
@@ -228,14 +255,17 @@ class ReorderPointEngine:
             safety_stock = self.calculate_safety_stock(
                 lt_demand['std_demand'],
                 local_config.lead_time_std_days,
-                local_config.service_level
+                local_config.service_level,
+                lt_demand['p90_demand'],
+                local_config.lead_time_days
             )
             
             # Calculate reorder point
             reorder_point = self.calculate_reorder_point(
                 lt_demand['p90_demand'],  # Use P90 for conservative approach
                 safety_stock,
-                local_config.review_period_days
+                local_config.review_period_days,
+                local_config.lead_time_days
             )
             
             # Calculate reorder quantity
@@ -263,7 +293,7 @@ class ReorderPointEngine:
             # Generate reasoning
             reasoning = self._generate_reasoning(
                 current_inventory, reorder_point, safety_stock, 
-                reorder_qty, lt_demand, urgency
+                reorder_qty, lt_demand, urgency, local_config.lead_time_days
             )
             
             return ReorderRecommendation(
@@ -286,14 +316,79 @@ class ReorderPointEngine:
             logger.error(f"Error generating reorder recommendation for {product_id}: {str(e)}")
             raise
     
+    def batch_reorder_records(self,
+                              product_ids: List[str],
+                              store_ids: List[str],
+                              current_inventory: np.ndarray,
+                              unit_cost: np.ndarray,
+                              daily_forecasts: np.ndarray,
+                              config: Optional[ReorderPointConfig] = None) -> List[Dict[str, Any]]:
+        """
+        Generate reorder recommendations as JSON-ready records.
+        
+        Each result column is converted to Python scalars in one pass; the
+        values match generate_reorder_recommendation item for item.
+        
+        Args:
+            product_ids: Product identifier per item
+            store_ids: Store identifier per item
+            current_inventory: Current inventory level per item, shape (n,)
+            unit_cost: Unit cost per item, shape (n,)
+            daily_forecasts: Daily forecasted demand per item, shape (n, days)
+            config: Optional configuration shared by all items
+            
+        Returns:
+            List of recommendation dictionaries, most urgent first
+        """
+        local_config = config or self.config
+        results = self.batch_reorder_arrays(current_inventory, unit_cost, daily_forecasts, local_config)
+        order = np.argsort(results['urgency_code'], kind='stable')
+        recommendation_date = datetime.now()
+        
+        inventory = current_inventory[order].astype(np.int32).tolist()
+        reorder_points = results['reorder_point'][order].tolist()
+        reorder_qtys = results['reorder_quantity'][order].tolist()
+        safety_stocks = results['safety_stock'][order].tolist()
+        p90_demands = results['demand_during_lt'][order].tolist()
+        total_costs = results['total_cost'][order].tolist()
+        urgencies = [URGENCY_LEVELS[code] for code in results['urgency_code'][order].tolist()]
+        
+        return [
+            {
+                'product_id': product_ids[i],
+                'store_id': store_ids[i],
+                'current_inventory': inv,
+                'reorder_point': reorder_point,
+                'reorder_quantity': reorder_qty,
+                'safety_stock': int(safety_stock),
+                'demand_during_lt': int(p90_demand),
+                'lead_time_days': local_config.lead_time_days,
+                'service_level': local_config.service_level,
+                'total_cost': total_cost,
+                'urgency': urgency,
+                'recommendation_date': recommendation_date,
+                'reasoning': self._generate_reasoning(
+                    inv, reorder_point, safety_stock,
+                    reorder_qty, {'p90_demand': p90_demand}, urgency,
+                    local_config.lead_time_days
+                )
+            }
+            for i, inv, reorder_point, reorder_qty, safety_stock, p90_demand, total_cost, urgency in zip(
+                order.tolist(), inventory, reorder_points, reorder_qtys,
+                safety_stocks, p90_demands, total_costs, urgencies
+            )
+        ]
+    
     def _generate_reasoning(self, 
                            current_inventory: int,
                            reorder_point: int,
                            safety_stock: int,
                            reorder_qty: int,
                            lt_demand: Dict[str, float],
-                           urgency: str) -> str:
+                           urgency: str,
+                           lead_time_days: Optional[int] = None) -> str:
         """Generate human-readable reasoning for the recommendation."""
+        lead_time_days = lead_time_days or self.config.lead_time_days
         reasoning_parts = []
         
         if current_inventory <= safety_stock:
@@ -301,7 +396,7 @@ class ReorderPointEngine:
         elif current_inventory <= reorder_point:
             reasoning_parts.append(f"Reorder needed: Current inventory ({current_inventory}) below reorder point ({reorder_point})")
         
-        reasoning_parts.append(f"P90 demand during {self.config.lead_time_days}-day lead time: {lt_demand['p90_demand']:.1f}")
+        reasoning_parts.append(f"P90 demand during {lead_time_days}-day lead time: {lt_demand['p90_demand']:.1f}")
         reasoning_parts.append(f"Safety stock: {safety_stock:.1f}")
         
         if reorder_qty > 0:
@@ -318,48 +413,175 @@ class ReorderPointEngine:
     def batch_reorder_recommendations(self,
                                     inventory_data: List[Dict[str, Any]],
                                     forecast_data: Dict[str, List[float]],
-                                    configs: Optional[Dict[str, ReorderPointConfig]] = None) -> List[ReorderRecommendation]:
+                                    configs: Optional[Union[ReorderPointConfig, Dict[str, ReorderPointConfig]]] = None) -> List[ReorderRecommendation]:
         """
         Generate reorder recommendations for multiple products.
         
         Args:
             inventory_data: List of inventory records
             forecast_data: Dictionary mapping product_id to daily forecasts
-            configs: Optional product-specific configurations
+            configs: Optional product-specific configurations, or a single
+                configuration applied to every product
             
         Returns:
             List of reorder recommendations
         """
-        recommendations = []
+        shared_config = configs if isinstance(configs, ReorderPointConfig) else None
         
+        # Group items by configuration so each group runs through the array
+        # kernel in one pass; configs are unhashable dataclasses, so key on identity
+        groups: Dict[int, Tuple[ReorderPointConfig, List[Dict[str, Any]]]] = {}
         for item in inventory_data:
             product_id = item['product_id']
-            store_id = item.get('store_id', 'default')
             
             if product_id not in forecast_data:
                 logger.warning(f"No forecast data for product {product_id}")
                 continue
             
-            # Get product-specific config or use default
-            config = configs.get(product_id) if configs else None
+            # Get the shared or product-specific config, or use default
+            if shared_config is not None:
+                config = shared_config
+            else:
+                config = (configs.get(product_id) if configs else None) or self.config
             
-            try:
-                recommendation = self.generate_reorder_recommendation(
-                    product_id=product_id,
-                    store_id=store_id,
-                    current_inventory=item['current_inventory'],
-                    daily_forecasts=forecast_data[product_id],
-                    unit_cost=item.get('unit_cost', 0.0),
-                    config=config
-                )
-                recommendations.append(recommendation)
-                
-            except Exception as e:
-                logger.error(f"Failed to generate recommendation for {product_id}: {str(e)}")
+            if len(forecast_data[product_id]) < config.lead_time_days:
+                logger.error(f"Failed to generate recommendation for {product_id}: "
+                             f"Insufficient forecast data. Need at least {config.lead_time_days} days.")
                 continue
+            
+            groups.setdefault(id(config), (config, []))[1].append(item)
+        
+        recommendations = []
+        for config, items in groups.values():
+            n = len(items)
+            lead_time = config.lead_time_days
+            recommendations.extend(self.batch_reorder_recommendations_np(
+                [item['product_id'] for item in items],
+                [item.get('store_id', 'default') for item in items],
+                np.fromiter((item['current_inventory'] for item in items), dtype=np.float64, count=n),
+                np.fromiter((item.get('unit_cost', 0.0) for item in items), dtype=np.float64, count=n),
+                np.array(
+                    [forecast_data[item['product_id']][:lead_time] for item in items],
+                    dtype=np.float32
+                ).reshape(n, lead_time),
+                config
+            ))
         
-        # Sort by urgency (critical first)
-        urgency_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
-        recommendations.sort(key=lambda x: urgency_order.get(x.urgency, 4))
+        # Each group is already ordered; sort by urgency (critical first) across groups
+        # by encoding urgency once and argsorting the codes
+        if len(groups) > 1:
+            urgency_codes = np.fromiter(
+                (URGENCY_CODES[rec.urgency] for rec in recommendations),
+                dtype=np.uint8, count=len(recommendations)
+            )
+            order = np.argsort(urgency_codes, kind='stable')
+            recommendations = [recommendations[i] for i in order.tolist()]
         
         return recommendations
+    
+    def batch_reorder_arrays(self,
+                             current_inventory: np.ndarray,
+                             unit_cost: np.ndarray,
+                             daily_forecasts: np.ndarray,
+                             config: Optional[ReorderPointConfig] = None) -> Dict[str, np.ndarray]:
+        """
+        Calculate reorder points for many items sharing one configuration at once.
+        
+        Args:
+            current_inventory: Current inventory level per item, shape (n,)
+            unit_cost: Unit cost per item, shape (n,)
+            daily_forecasts: Daily forecasted demand per item, shape (n, days)
+            config: Optional configuration override
+            
+        Returns:
+            Dictionary of per-item arrays: reorder_point, reorder_quantity,
+            safety_stock, demand_during_lt, total_cost and urgency_code
+            (an index into URGENCY_LEVELS)
+        """
+        local_config = config or self.config
+        lead_time = local_config.lead_time_days
+        
+        if daily_forecasts.shape[1] < lead_time:
+            raise ValueError(f"Insufficient forecast data. Need at least {lead_time} days.")
+        
+        # Demand during lead time, one row per item. Daily unit forecasts need no
+        # more than float32, which halves the bytes the reductions below stream
+        lt_forecasts = np.asarray(daily_forecasts[:, :lead_time], dtype=np.float32)
+        p90_demand = np.percentile(lt_forecasts, 90, axis=1)
+        std_demand = lt_forecasts.std(axis=1)
+        
+        # Safety stock: Z * sqrt(lead_time * std_demand^2 + demand^2 * std_lead_time^2)
+        z_score = z_score_for(local_config.service_level)
+        safety_stock = np.maximum(0, z_score * np.sqrt(
+            lead_time * std_demand**2 +
+            p90_demand**2 * local_config.lead_time_std_days**2
+        ))
+        
+        # Reorder point = demand during lead time + safety stock + review period demand
+        review_demand = p90_demand * (local_config.review_period_days / lead_time)
+        reorder_point = np.maximum(0, np.ceil(p90_demand + safety_stock + review_demand))
+        
+        # Order up to the reorder point, rounded to case packs and minimum order quantity
+        needed_quantity = reorder_point - current_inventory
+        if local_config.case_pack_size > 1:
+            needed_quantity = np.ceil(needed_quantity / local_config.case_pack_size) * local_config.case_pack_size
+        reorder_qty = np.where(
+            current_inventory >= reorder_point,
+            0,
+            np.maximum(needed_quantity, local_config.min_order_quantity)
+        )
+        
+        urgency_code = np.select(
+            [current_inventory <= safety_stock,
+             current_inventory <= reorder_point * 0.5,
+             current_inventory <= reorder_point],
+            [0, 1, 2],
+            default=3
+        )
+        
+        total_cost = reorder_qty * unit_cost
+        
+        # Cap orders that exceed the budget; the constraint increases urgency
+        if local_config.budget_cap:
+            over_budget = total_cost > local_config.budget_cap
+            if over_budget.any():
+                with np.errstate(divide='ignore'):
+                    max_qty = np.floor(local_config.budget_cap / unit_cost)
+                reorder_qty = np.where(over_budget, np.minimum(reorder_qty, max_qty), reorder_qty)
+                total_cost = reorder_qty * unit_cost
+                urgency_code = np.where(over_budget, 1, urgency_code)
+        
+        return {
+            'reorder_point': reorder_point.astype(np.int32),
+            'reorder_quantity': reorder_qty.astype(np.int32),
+            'safety_stock': safety_stock,
+            'demand_during_lt': p90_demand,
+            'total_cost': total_cost,
+            'urgency_code': urgency_code
+        }
+    
+    def batch_reorder_recommendations_np(self,
+                                         product_ids: List[str],
+                                         store_ids: List[str],
+                                         current_inventory: np.ndarray,
+                                         unit_cost: np.ndarray,
+                                         daily_forecasts: np.ndarray,
+                                         config: Optional[ReorderPointConfig] = None) -> List[ReorderRecommendation]:
+        """
+        Generate reorder recommendations from structure-of-arrays inputs.
+        
+        Args:
+            product_ids: Product identifier per item
+            store_ids: Store identifier per item
+            current_inventory: Current inventory level per item, shape (n,)
+            unit_cost: Unit cost per item, shape (n,)
+            daily_forecasts: Daily forecasted demand per item, shape (n, days)
+            config: Optional configuration shared by all items
+            
+        Returns:
+            List of reorder recommendations, most urgent first
+        """
+        records = self.batch_reorder_records(
+            product_ids, store_ids, current_inventory, unit_cost, daily_forecasts, config
+        )
+        return [ReorderRecommendation(**record) for record in records]
@@ -0,0 +1,81 @@
+"""
+What-if scenario expansion over store x product x day demand grids.
+"""
+
+import numpy as np
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+
+def apply_scenario(base_demand: np.ndarray,
+                   forecast_dates: np.ndarray,
+                   demand_multiplier: float = 1.0,
+                   promo_start_date: Optional[date] = None,
+                   promo_end_date: Optional[date] = None,
+                   promo_uplift_percent: float = 0.0) -> np.ndarray:
+    """
+    Apply a scenario's demand multiplier and promotional uplift to baseline demand.
+    
+    Args:
+        base_demand: Baseline daily demand, shape (stores, products, days)
+        forecast_dates: Date of each day column, shape (days,), datetime64[D]
+        demand_multiplier: Factor applied to every day
+        promo_start_date: First promotion day (inclusive)
+        promo_end_date: Last promotion day (inclusive)
+        promo_uplift_percent: Extra demand on promotion days, in percent
+    
+    Returns:
+        Scenario demand with the same shape as base_demand, as float32
+    """
+    # One multiplier per day, broadcast across every store and product
+    day_factor = np.full(len(forecast_dates), demand_multiplier, dtype=np.float32)
+    if promo_uplift_percent and promo_start_date is not None and promo_end_date is not None:
+        promo_days = (
+            (forecast_dates >= np.datetime64(promo_start_date, "D")) &
+            (forecast_dates <= np.datetime64(promo_end_date, "D"))
+        )
+        day_factor[promo_days] *= 1 + promo_uplift_percent / 100
+    
+    return np.asarray(base_demand, dtype=np.float32) * day_factor
+
+
+def scenario_forecast_rows(store_ids: List[str],
+                           product_ids: List[str],
+                           forecast_dates: np.ndarray,
+                           demand: np.ndarray,
+                           model_version: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Flatten a scenario demand grid into forecast rows for bulk_upsert_forecasts.
+    
+    Args:
+        store_ids: Store identifier per grid row
+        product_ids: Product identifier per grid column
+        forecast_dates: Date of each day, shape (days,), datetime64[D]
+        demand: Scenario demand, shape (stores, products, days)
+        model_version: Optional label stored with each forecast
+    
+    Returns:
+        List of forecast row dictionaries, one per store, product and day
+    """
+    n_stores, n_products, n_days = demand.shape
+    
+    # Build each column once with repeat/tile, then convert to Python values in bulk
+    stores = np.repeat(np.asarray(store_ids, dtype=object), n_products * n_days).tolist()
+    products = np.tile(np.repeat(np.asarray(product_ids, dtype=object), n_days), n_stores).tolist()
+    dates = np.tile(forecast_dates.astype("datetime64[us]"), n_stores * n_products).tolist()
+    horizons = np.tile(np.arange(1, n_days + 1), n_stores * n_products).tolist()
+    quantities = demand.reshape(-1).tolist()
+    
+    return [
+        {
+            'store_id': store_id,
+            'product_id': product_id,
+            'forecast_date': forecast_date,
+            'forecast_horizon_days': horizon,
+            'forecasted_quantity': quantity,
+            'model_version': model_version
+        }
+        for store_id, product_id, forecast_date, horizon, quantity in zip(
+            stores, products, dates, horizons, quantities
+        )
+    ]
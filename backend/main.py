@@ -3,14 +3,19 @@ Main FastAPI application for the Retail Inventory Management Platform.
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 from contextlib import asynccontextmanager
 
-from api.endpoints import auth, forecasting, inventory, purchase_orders, suppliers
+from api.endpoints import auth, forecasting, inventory, purchase_orders, sales, suppliers
+from core import cache
 from core.config import settings
-from models.database import engine, Base
+from core.forecasting.registry import get_forecaster, get_forecast_executor
+from models.database import engine, read_engine, Base
 
 
 @asynccontextmanager
@@ -19,15 +24,36 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting Retail Inventory Management Platform...")
     
-    # Create database tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Create database tables. Every worker would repeat this DDL round trip on
+    # boot, so deployments that manage the schema elsewhere turn it off.
+    if settings.RUN_DDL_ON_STARTUP:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        
+        print("✅ Database tables created")
     
-    print("✅ Database tables created")
+    # Warm the shared forecaster with persisted models before the first request.
+    # Without a model directory there is nothing to load, so Prophet stays unimported
+    # until a forecasting endpoint is actually hit.
+    if settings.FORECAST_MODEL_DIR:
+        loaded_models = await run_in_threadpool(get_forecaster().load_models)
+        print(f"✅ Loaded {loaded_models} forecasting models")
+    
+    # Optionally pay Prophet's cold start here rather than on the first request
+    if settings.PROPHET_WARMUP:
+        await run_in_threadpool(get_forecaster().warmup)
+        print("✅ Prophet warmed up")
     yield
     
     # Shutdown
     print("🛑 Shutting down...")
+    get_forecast_executor().shutdown(wait=False)
+    
+    # Close pooled database and Redis connections
+    await cache.close()
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 # Create FastAPI app
@@ -37,13 +63,14 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
 # Add middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.allowed_origins_list,
+    allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -54,12 +81,16 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS
 )
 
+# Forecast and recommendation payloads are long numeric lists that compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(forecasting.router, prefix="/api/v1/forecasting", tags=["Forecasting"])
 app.include_router(inventory.router, prefix="/api/v1/inventory", tags=["Inventory"])
 app.include_router(purchase_orders.router, prefix="/api/v1/purchase-orders", tags=["Purchase Orders"])
 app.include_router(suppliers.router, prefix="/api/v1/suppliers", tags=["Suppliers"])
+app.include_router(sales.router, prefix="/api/v1/sales", tags=["Sales"])
 
 
 @app.get("/")
@@ -79,10 +110,16 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    # The reload watcher and per-request access log are for local development;
+    # otherwise serve with uvloop/httptools (both ship with uvicorn[standard])
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
+        host=settings.HOST,
+        port=settings.PORT,
+        reload=settings.DEBUG,
+        workers=1 if settings.DEBUG else settings.WORKERS,
+        loop="uvloop",
+        http="httptools",
+        access_log=settings.DEBUG,
+        log_level="info" if settings.DEBUG else "warning"
     )
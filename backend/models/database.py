@@ -2,37 +2,123 @@
 Database models and configuration.
 """
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, func, insert, MetaData
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, JSON
-from sqlalchemy.orm import relationship
-from datetime import datetime
-from typing import Optional
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, JSON, Index
+from sqlalchemy import LargeBinary, TypeDecorator
+from sqlalchemy.orm import relationship, validates
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Any, Dict, List, Optional
+import os
 import uuid
 
 from core.config import settings
 
-# Database engine - using PostgreSQL from environment
-DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+# Database engine - using PostgreSQL from environment (settings normalize it to asyncpg)
+DATABASE_URL = settings.DATABASE_URL
 
-# Create async engine for PostgreSQL
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW
+# Per-connection SQLite settings: WAL journaling with NORMAL sync avoids an fsync
+# per transaction, and temp tables, page cache (64 MB) and mmap stay in memory
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
 )
 
-# Session factory
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to each new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _create_engine(url: str):
+    """Create a pooled async engine; connections are reused across requests."""
+    db_url = make_url(url)
+    if db_url.get_backend_name() == "sqlite" and db_url.database in (None, "", ":memory:"):
+        # An in-memory database lives in a single connection; keep the dialect's
+        # default StaticPool instead of a queue of separate empty databases
+        pool_options = {}
+    else:
+        # aiosqlite defaults to NullPool, which rejects the queue arguments, so
+        # the queue pool is requested explicitly for every file or server URL
+        pool_options = {
+            'poolclass': AsyncAdaptedQueuePool,
+            'pool_size': settings.DATABASE_POOL_SIZE,
+            'max_overflow': settings.DATABASE_MAX_OVERFLOW,
+            'pool_timeout': settings.DATABASE_POOL_TIMEOUT,
+        }
+    
+    db_engine = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        **pool_options
+    )
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+# Create async engine for PostgreSQL
+engine = _create_engine(DATABASE_URL)
+
+# Read-only endpoints use a replica when one is configured; otherwise they share
+# the primary engine and its pool
+read_engine = _create_engine(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else engine
+
+# Session factories
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+AsyncReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 # Base class for models
 Base = declarative_base()
 
+
+class GUID(TypeDecorator):
+    """
+    UUID column stored compactly: native UUID on PostgreSQL, 16-byte BLOB elsewhere.
+    
+    Values cross the ORM boundary as 32-character hex strings (the format
+    _new_id generates); dashed UUID strings are accepted on input.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        value = value if isinstance(value, uuid.UUID) else uuid.UUID(value)
+        return value if dialect.name == "postgresql" else value.bytes
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value.hex if isinstance(value, uuid.UUID) else uuid.UUID(bytes=value).hex
+
+
+def _new_id() -> str:
+    """Generate a primary key: a random UUID as 32 hex characters, without dashes."""
+    return uuid.uuid4().hex
+
 # Metadata
 metadata = MetaData()
 
@@ -41,22 +127,22 @@ class User(Base):
     """User model for authentication and authorization."""
     __tablename__ = "users"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=_new_id)
     email = Column(String, unique=True, index=True, nullable=False)
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     full_name = Column(String)
     role = Column(String, default="buyer")  # buyer, planner, approver, admin
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
 class Store(Base):
     """Store/location model."""
     __tablename__ = "stores"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=_new_id)
     name = Column(String, nullable=False)
     code = Column(String, unique=True, nullable=False)
     address = Column(Text)
@@ -66,15 +152,21 @@ class Store(Base):
     postal_code = Column(String)
     timezone = Column(String, default="UTC")
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Relationships; collections are large, so load them only with explicit options
+    inventory = relationship("Inventory", back_populates="store", lazy="raise")
+    sales_transactions = relationship("SalesTransaction", back_populates="store", lazy="raise")
+    forecasts = relationship("Forecast", back_populates="store", lazy="raise")
+    purchase_orders = relationship("PurchaseOrder", back_populates="store", lazy="raise")
 
 
 class Supplier(Base):
     """Supplier/vendor model."""
     __tablename__ = "suppliers"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=_new_id)
     name = Column(String, nullable=False)
     code = Column(String, unique=True, nullable=False)
     contact_email = Column(String)
@@ -84,15 +176,19 @@ class Supplier(Base):
     lead_time_variance_days = Column(Integer, default=2)
     payment_terms = Column(String)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Relationships
+    products = relationship("Product", back_populates="supplier", lazy="raise")
+    purchase_orders = relationship("PurchaseOrder", back_populates="supplier", lazy="raise")
 
 
 class Product(Base):
     """Product/SKU model."""
     __tablename__ = "products"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=_new_id)
     sku = Column(String, unique=True, nullable=False)
     name = Column(String, nullable=False)
     description = Column(Text)
@@ -102,62 +198,79 @@ class Product(Base):
     unit_price = Column(Float)
     case_pack_size = Column(Integer, default=1)
     min_order_quantity = Column(Integer, default=1)
-    supplier_id = Column(String, ForeignKey("suppliers.id"))
+    supplier_id = Column(GUID, ForeignKey("suppliers.id"))
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    supplier = relationship("Supplier", backref="products")
+    supplier = relationship("Supplier", back_populates="products", lazy="selectin")
+    inventory = relationship("Inventory", back_populates="product", lazy="raise")
+    sales_transactions = relationship("SalesTransaction", back_populates="product", lazy="raise")
+    forecasts = relationship("Forecast", back_populates="product", lazy="raise")
+    purchase_order_items = relationship("PurchaseOrderItem", back_populates="product", lazy="raise")
 
 
 class Inventory(Base):
     """Inventory levels by store and product."""
     __tablename__ = "inventory"
+    __table_args__ = (
+        Index("ix_inv_store_product", "store_id", "product_id", unique=True),
+    )
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    store_id = Column(String, ForeignKey("stores.id"), nullable=False)
-    product_id = Column(String, ForeignKey("products.id"), nullable=False)
+    id = Column(GUID, primary_key=True, default=_new_id)
+    store_id = Column(GUID, ForeignKey("stores.id"), nullable=False)
+    product_id = Column(GUID, ForeignKey("products.id"), nullable=False)
     quantity_on_hand = Column(Integer, default=0)
     quantity_committed = Column(Integer, default=0)
     quantity_available = Column(Integer, default=0)
     reorder_point = Column(Integer, default=0)
     safety_stock = Column(Integer, default=0)
     max_stock = Column(Integer, default=0)
-    last_updated = Column(DateTime, default=datetime.utcnow)
+    last_updated = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    store = relationship("Store", backref="inventory")
-    product = relationship("Product", backref="inventory")
+    store = relationship("Store", back_populates="inventory", lazy="selectin")
+    product = relationship("Product", back_populates="inventory", lazy="selectin")
 
 
 class SalesTransaction(Base):
     """Sales transaction history."""
     __tablename__ = "sales_transactions"
+    __table_args__ = (
+        # quantity_sold trails the key so per-product sales sums are index-only
+        Index("ix_sales_store_prod_date", "store_id", "product_id", "transaction_date", "quantity_sold"),
+    )
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    store_id = Column(String, ForeignKey("stores.id"), nullable=False)
-    product_id = Column(String, ForeignKey("products.id"), nullable=False)
+    id = Column(GUID, primary_key=True, default=_new_id)
+    store_id = Column(GUID, ForeignKey("stores.id"), nullable=False)
+    product_id = Column(GUID, ForeignKey("products.id"), nullable=False)
     transaction_date = Column(DateTime, nullable=False)
     quantity_sold = Column(Integer, nullable=False)
     unit_price = Column(Float, nullable=False)
     total_amount = Column(Float, nullable=False)
     customer_id = Column(String)
     transaction_type = Column(String, default="sale")  # sale, return, adjustment
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
-    # Relationships
-    store = relationship("Store", backref="sales_transactions")
-    product = relationship("Product", backref="sales_transactions")
+    # Relationships; high-volume rows, so parents are loaded only on request
+    store = relationship("Store", back_populates="sales_transactions", lazy="raise")
+    product = relationship("Product", back_populates="sales_transactions", lazy="raise")
 
 
 class Forecast(Base):
     """Demand forecasts by product, store, and date."""
     __tablename__ = "forecasts"
+    __table_args__ = (
+        Index(
+            "ix_forecast_store_prod_date", "store_id", "product_id", "forecast_date",
+            unique=True, postgresql_include=["forecasted_quantity"]
+        ),
+    )
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    store_id = Column(String, ForeignKey("stores.id"), nullable=False)
-    product_id = Column(String, ForeignKey("products.id"), nullable=False)
+    id = Column(GUID, primary_key=True, default=_new_id)
+    store_id = Column(GUID, ForeignKey("stores.id"), nullable=False)
+    product_id = Column(GUID, ForeignKey("products.id"), nullable=False)
     forecast_date = Column(DateTime, nullable=False)
     forecast_horizon_days = Column(Integer, nullable=False)
     forecasted_quantity = Column(Float, nullable=False)
@@ -165,33 +278,45 @@ class Forecast(Base):
     confidence_upper = Column(Float)
     confidence_level = Column(Float, default=0.95)
     model_version = Column(String)
-    accuracy_metrics = Column(JSON)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    
+    # Relationships; high-volume rows, so parents are loaded only on request
+    store = relationship("Store", back_populates="forecasts", lazy="raise")
+    product = relationship("Product", back_populates="forecasts", lazy="raise")
+    metrics = relationship("ForecastMetrics", back_populates="forecast", uselist=False, lazy="raise")
+
+
+class ForecastMetrics(Base):
+    """Accuracy metrics for a forecast, kept out of the narrow, high-volume forecasts table."""
+    __tablename__ = "forecast_metrics"
+    
+    forecast_id = Column(GUID, ForeignKey("forecasts.id", ondelete="CASCADE"), primary_key=True)
+    accuracy_metrics = Column(JSON, nullable=False)
     
     # Relationships
-    store = relationship("Store", backref="forecasts")
-    product = relationship("Product", backref="forecasts")
+    forecast = relationship("Forecast", back_populates="metrics", lazy="raise")
 
 
 class PurchaseOrder(Base):
     """Purchase order model."""
     __tablename__ = "purchase_orders"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=_new_id)
     po_number = Column(String, unique=True, nullable=False)
-    supplier_id = Column(String, ForeignKey("suppliers.id"), nullable=False)
-    store_id = Column(String, ForeignKey("stores.id"), nullable=False)
+    supplier_id = Column(GUID, ForeignKey("suppliers.id"), nullable=False)
+    store_id = Column(GUID, ForeignKey("stores.id"), nullable=False)
     status = Column(String, default="draft")  # draft, pending_approval, approved, sent, received
     total_amount = Column(Float, default=0.0)
     expected_delivery_date = Column(DateTime)
-    created_by = Column(String, ForeignKey("users.id"))
-    approved_by = Column(String, ForeignKey("users.id"))
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    created_by = Column(GUID, ForeignKey("users.id"))
+    approved_by = Column(GUID, ForeignKey("users.id"))
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    supplier = relationship("Supplier", backref="purchase_orders")
-    store = relationship("Store", backref="purchase_orders")
+    supplier = relationship("Supplier", back_populates="purchase_orders", lazy="selectin")
+    store = relationship("Store", back_populates="purchase_orders", lazy="selectin")
+    items = relationship("PurchaseOrderItem", back_populates="purchase_order", lazy="selectin")
     created_by_user = relationship("User", foreign_keys=[created_by])
     approved_by_user = relationship("User", foreign_keys=[approved_by])
 
@@ -200,24 +325,126 @@ class PurchaseOrderItem(Base):
     """Individual items in a purchase order."""
     __tablename__ = "purchase_order_items"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    purchase_order_id = Column(String, ForeignKey("purchase_orders.id"), nullable=False)
-    product_id = Column(String, ForeignKey("products.id"), nullable=False)
+    id = Column(GUID, primary_key=True, default=_new_id)
+    purchase_order_id = Column(GUID, ForeignKey("purchase_orders.id"), nullable=False, index=True)
+    product_id = Column(GUID, ForeignKey("products.id"), nullable=False)
     quantity_ordered = Column(Integer, default=0)
     unit_cost = Column(Float, default=0.0)
-    total_cost = Column(Float, default=0.0)
+    total_cost = Column(Float, default=0.0)  # kept in step by _update_total_cost
     notes = Column(Text)
     
     # Relationships
-    purchase_order = relationship("PurchaseOrder", backref="items")
-    product = relationship("Product", backref="purchase_order_items")
+    purchase_order = relationship("PurchaseOrder", back_populates="items", lazy="raise")
+    product = relationship("Product", back_populates="purchase_order_items", lazy="selectin")
+    
+    @validates("quantity_ordered", "unit_cost")
+    def _update_total_cost(self, key, value):
+        """Recompute the stored line total whenever quantity or cost is set."""
+        quantity = value if key == "quantity_ordered" else self.quantity_ordered
+        unit_cost = value if key == "unit_cost" else self.unit_cost
+        self.total_cost = (quantity or 0) * (unit_cost or 0.0)
+        return value
+
+
+async def bulk_insert(session: AsyncSession, model, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert many rows of a model in one executemany batch.
+    
+    Args:
+        session: Database session
+        model: Mapped model class, e.g. Forecast
+        rows: Column values per row; ids are generated for rows without one
+    """
+    if not rows:
+        return
+    
+    _fill_ids(rows)
+    await session.execute(insert(model), rows)
+
+
+# Columns refreshed when a forecast for the same store/product/date already exists
+FORECAST_UPSERT_COLUMNS = (
+    "forecast_horizon_days", "forecasted_quantity", "confidence_lower",
+    "confidence_upper", "confidence_level", "model_version",
+)
+
+
+async def bulk_upsert_forecasts(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert forecasts, replacing existing ones for the same store, product and date.
+    
+    Args:
+        session: Database session
+        rows: Forecast column values per row; every row must have the same keys
+    """
+    if not rows:
+        return
+    
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(Forecast.__table__)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(Forecast.__table__)
+    else:
+        raise ValueError(f"Forecast upsert is not supported on {dialect}")
+    
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["store_id", "product_id", "forecast_date"],
+        set_={column: stmt.excluded[column] for column in FORECAST_UPSERT_COLUMNS if column in rows[0]}
+    )
+    
+    # One execute with the whole parameter list. There is no RETURNING, so this
+    # is a plain DBAPI executemany: the statement still runs once per row (asyncpg
+    # prepares it once and pipelines the rows), but in a single round of calls
+    _fill_ids(rows)
+    await session.execute(stmt, rows)
+
+
+def _fill_ids(rows: List[Dict[str, Any]]) -> None:
+    """Generate all missing row ids in one pass instead of per-row column defaults."""
+    ids = os.urandom(16 * len(rows)).hex()
+    for i, row in enumerate(rows):
+        if row.get("id") is None:
+            row["id"] = ids[32 * i:32 * (i + 1)]
 
 
 # Database dependency
 async def get_db():
-    """Database session dependency."""
+    """
+    Database session dependency.
+    
+    The whole request runs in one transaction that rolls back if the handler
+    raises. FastAPI runs the code after yield only once the response has been
+    sent, so a commit there could fail behind a 2xx: handlers that write must
+    await session.commit() themselves before returning. The commit on exit only
+    closes out transactions that wrote nothing. Handlers needing per-item
+    isolation can nest savepoints with session.begin_nested().
+    """
     async with AsyncSessionLocal() as session:
-        try:
+        async with session.begin():
             yield session
+
+
+async def get_ro_db():
+    """
+    Database session dependency for read-only endpoints.
+    
+    The session is bound to one connection that refuses writes for as long as
+    the request holds it: PostgreSQL runs its transactions READ ONLY and SQLite
+    sets query_only. read_engine may be the primary engine, so the SQLite
+    setting is cleared again before the connection goes back to the pool.
+    """
+    async with read_engine.connect() as conn:
+        dialect = read_engine.dialect.name
+        if dialect == "postgresql":
+            # Reset by SQLAlchemy when the connection is returned to the pool
+            await conn.execution_options(postgresql_readonly=True)
+        elif dialect == "sqlite":
+            await conn.exec_driver_sql("PRAGMA query_only = ON")
+        try:
+            async with AsyncReadSessionLocal(bind=conn) as session:
+                yield session
         finally:
-            await session.close()
+            await conn.rollback()
+            if dialect == "sqlite":
+                await conn.exec_driver_sql("PRAGMA query_only = OFF")
@@ -0,0 +1,165 @@
+"""
+Read-only list queries for high-volume tables.
+
+These run as SQLAlchemy Core selects over the mapped tables and validate the
+result rows into response schemas in one TypeAdapter pass, skipping ORM
+instance hydration. Statements are built with lambda_stmt, so each filter
+combination is compiled to SQL once and later calls only bind new parameter
+values. Writes still go through the ORM models.
+
+Consumers: GET /api/v1/sales/ (list_sales_transactions) and
+GET /api/v1/forecasting/forecasts (list_forecasts).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pydantic import TypeAdapter
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database import SalesTransaction, Forecast, Inventory, PurchaseOrderItem
+from models.schemas import SalesTransactionResponse, ForecastResponse
+
+# Built once; validate result rows by attribute and serialize list responses
+sales_transactions_adapter = TypeAdapter(List[SalesTransactionResponse])
+forecasts_adapter = TypeAdapter(List[ForecastResponse])
+
+# Core tables behind the ORM models
+sales_tx_core = SalesTransaction.__table__
+forecast_core = Forecast.__table__
+inventory_core = Inventory.__table__
+po_item_core = PurchaseOrderItem.__table__
+
+
+async def list_sales_transactions(session: AsyncSession,
+                                  store_id: Optional[str] = None,
+                                  product_id: Optional[str] = None,
+                                  since: Optional[datetime] = None,
+                                  limit: int = 1000) -> List[SalesTransactionResponse]:
+    """
+    List sales transactions, newest first.
+    
+    Args:
+        session: Database session
+        store_id: Optional store filter
+        product_id: Optional product filter
+        since: Only include transactions on or after this time
+        limit: Maximum number of rows to return
+    
+    Returns:
+        List of sales transaction responses
+    """
+    stmt = lambda_stmt(lambda: select(*sales_tx_core.c))
+    if store_id is not None:
+        stmt += lambda s: s.where(sales_tx_core.c.store_id == store_id)
+    if product_id is not None:
+        stmt += lambda s: s.where(sales_tx_core.c.product_id == product_id)
+    if since is not None:
+        stmt += lambda s: s.where(sales_tx_core.c.transaction_date >= since)
+    stmt += lambda s: s.order_by(sales_tx_core.c.transaction_date.desc()).limit(limit)
+    
+    result = await session.execute(stmt)
+    return sales_transactions_adapter.validate_python(result.all())
+
+
+async def list_forecasts(session: AsyncSession,
+                         store_id: Optional[str] = None,
+                         product_id: Optional[str] = None,
+                         since: Optional[datetime] = None,
+                         limit: int = 1000) -> List[ForecastResponse]:
+    """
+    List stored forecasts in forecast-date order.
+    
+    Args:
+        session: Database session
+        store_id: Optional store filter
+        product_id: Optional product filter
+        since: Only include forecasts dated on or after this time
+        limit: Maximum number of rows to return
+    
+    Returns:
+        List of forecast responses
+    """
+    stmt = lambda_stmt(lambda: select(*forecast_core.c))
+    if store_id is not None:
+        stmt += lambda s: s.where(forecast_core.c.store_id == store_id)
+    if product_id is not None:
+        stmt += lambda s: s.where(forecast_core.c.product_id == product_id)
+    if since is not None:
+        stmt += lambda s: s.where(forecast_core.c.forecast_date >= since)
+    stmt += lambda s: s.order_by(forecast_core.c.forecast_date).limit(limit)
+    
+    result = await session.execute(stmt)
+    return forecasts_adapter.validate_python(result.all())
+
+
+async def inventory_availability(session: AsyncSession,
+                                 store_id: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Compute available quantity (on hand minus committed) for many inventory rows.
+    
+    Args:
+        session: Database session
+        store_id: Optional store filter
+        
+    Returns:
+        Dictionary of per-row arrays: id, product_id and quantity_available
+    """
+    stmt = lambda_stmt(lambda: select(
+        inventory_core.c.id, inventory_core.c.product_id,
+        inventory_core.c.quantity_on_hand, inventory_core.c.quantity_committed
+    ))
+    if store_id is not None:
+        stmt += lambda s: s.where(inventory_core.c.store_id == store_id)
+    
+    rows = (await session.execute(stmt)).all()
+    ids, product_ids, on_hand, committed = _columns(rows, 4)
+    
+    # Arithmetic runs column-wise in NumPy rather than once per row in Python
+    return {
+        'id': ids,
+        'product_id': product_ids,
+        'quantity_available': np.nan_to_num(on_hand - committed).astype(np.int32)
+    }
+
+
+async def purchase_order_item_totals(session: AsyncSession,
+                                     purchase_order_id: str) -> Dict[str, Any]:
+    """
+    Fetch line totals (quantity ordered times unit cost) for a purchase order.
+    
+    Args:
+        session: Database session
+        purchase_order_id: Purchase order identifier
+        
+    Returns:
+        Dictionary of per-line arrays: id and total_cost, plus the order total
+    """
+    # Multiplied in SQL rather than read from the stored total_cost, which rows
+    # written outside the ORM may not keep up to date
+    stmt = lambda_stmt(lambda: select(
+        po_item_core.c.id,
+        (po_item_core.c.quantity_ordered * po_item_core.c.unit_cost).label("total_cost")
+    ).where(po_item_core.c.purchase_order_id == purchase_order_id))
+    
+    rows = (await session.execute(stmt)).all()
+    ids, total_cost = _columns(rows, 2)
+    
+    total_cost = np.nan_to_num(total_cost)
+    return {
+        'id': ids,
+        'total_cost': total_cost,
+        'total_amount': float(total_cost.sum())
+    }
+
+
+def _columns(rows, width: int):
+    """Transpose result rows into per-column arrays; NULLs become NaN in numeric columns."""
+    if not rows:
+        return tuple(np.empty(0) for _ in range(width))
+    return tuple(
+        np.array(column, dtype=object if isinstance(column[0], str) else np.float64)
+        for column in zip(*rows)
+    )
@@ -2,10 +2,11 @@
 Pydantic schemas for API requests and responses.
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
+from pydantic import AfterValidator, BaseModel, BeforeValidator, ConfigDict, Field
+from typing import Annotated, Generic, List, Literal, Optional, Dict, Any, TypeVar
 from datetime import datetime, date
 from enum import Enum
+import uuid
 
 
 # Enums
@@ -31,16 +32,54 @@ class TransactionType(str, Enum):
     ADJUSTMENT = "adjustment"
 
 
+# Schema field types for the enums above. Literal validates as a plain string
+# membership check in pydantic-core and serializes without enum objects.
+UserRoleValue = Literal["buyer", "planner", "approver", "admin"]
+POStatusValue = Literal["draft", "pending_approval", "approved", "sent", "received", "cancelled"]
+TransactionTypeValue = Literal["sale", "return", "adjustment"]
+
+
+def _normalize_entity_id(value: str) -> str:
+    """Accept any UUID spelling and return the 32-character hex form GUID columns use."""
+    try:
+        return uuid.UUID(value).hex
+    except ValueError:
+        raise ValueError("must be a UUID")
+
+
+# Every schema field backed by a GUID column uses this type. Checking ids here
+# turns a malformed id into a 422 instead of a failed parameter bind in the
+# database layer.
+EntityId = Annotated[str, AfterValidator(_normalize_entity_id)]
+
+
+def _truncate_to_date(value: Any) -> Any:
+    """Drop the time of day from datetimes read back into date fields."""
+    return value.date() if isinstance(value, datetime) else value
+
+
+# forecasts.forecast_date is a DateTime column holding one row per day; read
+# back as a date whatever time of day the writer stored
+ForecastDate = Annotated[date, BeforeValidator(_truncate_to_date)]
+
+
 # Base schemas
 class BaseSchema(BaseModel):
     """Base schema with common fields."""
     
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            date: lambda v: v.isoformat()
-        }
+    # Pydantic v2 already serializes datetime/date as ISO 8601; enum members
+    # passed in are stored as their string values. Schemas are never mutated
+    # after validation, so they are frozen like RequestSchema.
+    model_config = ConfigDict(
+        from_attributes=True, use_enum_values=True, frozen=True,
+        extra="ignore", populate_by_name=True
+    )
+
+
+class RequestSchema(BaseModel):
+    """Base schema for immutable request bodies."""
+    
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
 
 # User schemas
@@ -48,7 +87,7 @@ class UserBase(BaseSchema):
     email: str = Field(..., description="User email address")
     username: str = Field(..., description="Username")
     full_name: Optional[str] = Field(None, description="Full name")
-    role: UserRole = Field(UserRole.BUYER, description="User role")
+    role: UserRoleValue = Field(UserRole.BUYER.value, description="User role")
 
 
 class UserCreate(UserBase):
@@ -59,12 +98,12 @@ class UserUpdate(BaseSchema):
     email: Optional[str] = None
     username: Optional[str] = None
     full_name: Optional[str] = None
-    role: Optional[UserRole] = None
+    role: Optional[UserRoleValue] = None
     is_active: Optional[bool] = None
 
 
 class UserResponse(UserBase):
-    id: str
+    id: EntityId
     is_active: bool
     created_at: datetime
     updated_at: datetime
@@ -98,7 +137,7 @@ class StoreUpdate(BaseSchema):
 
 
 class StoreResponse(StoreBase):
-    id: str
+    id: EntityId
     is_active: bool
     created_at: datetime
     updated_at: datetime
@@ -132,7 +171,7 @@ class SupplierUpdate(BaseSchema):
 
 
 class SupplierResponse(SupplierBase):
-    id: str
+    id: EntityId
     is_active: bool
     created_at: datetime
     updated_at: datetime
@@ -149,7 +188,7 @@ class ProductBase(BaseSchema):
     unit_price: Optional[float] = Field(None, ge=0, description="Unit price")
     case_pack_size: int = Field(1, ge=1, description="Case pack size")
     min_order_quantity: int = Field(1, ge=1, description="Minimum order quantity")
-    supplier_id: str = Field(..., description="Supplier ID")
+    supplier_id: EntityId = Field(..., description="Supplier ID")
 
 
 class ProductCreate(ProductBase):
@@ -166,11 +205,11 @@ class ProductUpdate(BaseSchema):
     unit_cost: Optional[float] = None
     case_pack_size: Optional[int] = None
     min_order_quantity: Optional[int] = None
-    supplier_id: Optional[str] = None
+    supplier_id: Optional[EntityId] = None
 
 
 class ProductResponse(ProductBase):
-    id: str
+    id: EntityId
     is_active: bool
     created_at: datetime
     updated_at: datetime
@@ -178,8 +217,8 @@ class ProductResponse(ProductBase):
 
 # Inventory schemas
 class InventoryBase(BaseSchema):
-    store_id: str = Field(..., description="Store ID")
-    product_id: str = Field(..., description="Product ID")
+    store_id: EntityId = Field(..., description="Store ID")
+    product_id: EntityId = Field(..., description="Product ID")
     quantity_on_hand: int = Field(0, ge=0, description="Quantity on hand")
     quantity_committed: int = Field(0, ge=0, description="Committed quantity")
     quantity_available: int = Field(0, ge=0, description="Available quantity")
@@ -202,7 +241,7 @@ class InventoryUpdate(BaseSchema):
 
 
 class InventoryResponse(InventoryBase):
-    id: str
+    id: EntityId
     last_updated: datetime
 
 
@@ -212,14 +251,14 @@ InventoryItem = InventoryResponse
 
 # Sales transaction schemas
 class SalesTransactionBase(BaseSchema):
-    store_id: str = Field(..., description="Store ID")
-    product_id: str = Field(..., description="Product ID")
+    store_id: EntityId = Field(..., description="Store ID")
+    product_id: EntityId = Field(..., description="Product ID")
     transaction_date: datetime = Field(..., description="Transaction date")
     quantity_sold: int = Field(..., gt=0, description="Quantity sold")
     unit_price: float = Field(..., gt=0, description="Unit price")
     total_amount: float = Field(..., gt=0, description="Total amount")
     customer_id: Optional[str] = None
-    transaction_type: TransactionType = Field(TransactionType.SALE, description="Transaction type")
+    transaction_type: TransactionTypeValue = Field(TransactionType.SALE.value, description="Transaction type")
 
 
 class SalesTransactionCreate(SalesTransactionBase):
@@ -227,22 +266,21 @@ class SalesTransactionCreate(SalesTransactionBase):
 
 
 class SalesTransactionResponse(SalesTransactionBase):
-    id: str
+    id: EntityId
     created_at: datetime
 
 
 # Forecast schemas
 class ForecastBase(BaseSchema):
-    store_id: str = Field(..., description="Store ID")
-    product_id: str = Field(..., description="Product ID")
-    forecast_date: date = Field(..., description="Forecast date")
+    store_id: EntityId = Field(..., description="Store ID")
+    product_id: EntityId = Field(..., description="Product ID")
+    forecast_date: ForecastDate = Field(..., description="Forecast date")
     forecast_horizon_days: int = Field(..., gt=0, description="Forecast horizon in days")
     forecasted_quantity: float = Field(..., description="Forecasted quantity")
     confidence_lower: Optional[float] = Field(None, description="Lower confidence bound")
     confidence_upper: Optional[float] = Field(None, description="Upper confidence bound")
     confidence_level: float = Field(0.95, description="Confidence level")
     model_version: Optional[str] = None
-    accuracy_metrics: Optional[Dict[str, Any]] = None
 
 
 class ForecastCreate(ForecastBase):
@@ -250,14 +288,14 @@ class ForecastCreate(ForecastBase):
 
 
 class ForecastResponse(ForecastBase):
-    id: str
+    id: EntityId
     created_at: datetime
 
 
 # Purchase order schemas
 class PurchaseOrderBase(BaseSchema):
-    supplier_id: str = Field(..., description="Supplier ID")
-    store_id: str = Field(..., description="Store ID")
+    supplier_id: EntityId = Field(..., description="Supplier ID")
+    store_id: EntityId = Field(..., description="Store ID")
     expected_delivery_date: Optional[datetime] = None
 
 
@@ -266,24 +304,24 @@ class PurchaseOrderCreate(PurchaseOrderBase):
 
 
 class PurchaseOrderUpdate(BaseSchema):
-    status: Optional[POStatus] = None
+    status: Optional[POStatusValue] = None
     expected_delivery_date: Optional[datetime] = None
 
 
 class PurchaseOrderResponse(PurchaseOrderBase):
-    id: str
+    id: EntityId
     po_number: str
-    status: POStatus
+    status: POStatusValue
     total_amount: float
-    created_by: str
-    approved_by: Optional[str] = None
+    created_by: EntityId
+    approved_by: Optional[EntityId] = None
     created_at: datetime
     updated_at: datetime
 
 
 # Purchase order item schemas
 class PurchaseOrderItemBase(BaseSchema):
-    product_id: str = Field(..., description="Product ID")
+    product_id: EntityId = Field(..., description="Product ID")
     quantity_ordered: int = Field(..., gt=0, description="Quantity ordered")
     unit_cost: float = Field(..., gt=0, description="Unit cost")
     notes: Optional[str] = None
@@ -294,8 +332,8 @@ class PurchaseOrderItemCreate(PurchaseOrderItemBase):
 
 
 class PurchaseOrderItemResponse(PurchaseOrderItemBase):
-    id: str
-    purchase_order_id: str
+    id: EntityId
+    purchase_order_id: EntityId
     total_cost: float
 
 
@@ -310,8 +348,12 @@ class TokenData(BaseSchema):
 
 
 # API response schemas
-class PaginatedResponse(BaseSchema):
-    items: List[Any]
+T = TypeVar("T")
+
+
+class PaginatedResponse(BaseSchema, Generic[T]):
+    """Page of results; parametrize as PaginatedResponse[XResponse] for a typed serializer."""
+    items: List[T]
     total: int
     page: int
     size: int
@@ -341,3 +383,63 @@ class ScenarioRequest(BaseSchema):
     promo_start_date: Optional[date] = None
     promo_end_date: Optional[date] = None
     promo_uplift_percent: float = Field(0.0, ge=0, description="Promotional uplift percentage")
+
+
+# Forecasting endpoint request schemas
+class SalesRecord(RequestSchema):
+    date: date
+    quantity_sold: float = Field(..., description="Units sold on this date")
+
+
+class ForecastTrainRequest(RequestSchema):
+    product_id: str = Field(..., description="Product ID")
+    store_id: Optional[str] = Field(None, description="Store ID (omit for a chain-wide model)")
+    sales_data: List[SalesRecord] = Field(..., min_length=1, description="Historical daily sales")
+
+
+class ForecastUpdateRequest(RequestSchema):
+    store_id: Optional[str] = Field(None, description="Store ID (omit for a chain-wide model)")
+    new_sales_data: List[SalesRecord] = Field(..., min_length=1, description="New daily sales")
+
+
+class ForecastGenerateRequest(RequestSchema):
+    product_id: str = Field(..., description="Product ID")
+    store_id: Optional[str] = Field(None, description="Store ID (omit for a chain-wide model)")
+    horizon_days: int = Field(30, ge=1, le=365, description="Forecast horizon in days")
+    include_components: bool = Field(False, description="Include trend/seasonality breakdown")
+
+
+class EnsembleForecastRequest(RequestSchema):
+    product_id: str = Field(..., description="Product ID")
+    store_id: Optional[str] = Field(None, description="Store ID (omit for a chain-wide model)")
+    horizon_days: int = Field(30, ge=1, le=365, description="Forecast horizon in days")
+
+
+# Reorder endpoint request schemas
+class ReorderConfigRequest(RequestSchema):
+    service_level: float = Field(0.95, gt=0, lt=1, description="Target service level")
+    lead_time_days: int = Field(7, ge=1, description="Supplier lead time in days")
+    lead_time_std_days: float = Field(2.0, ge=0, description="Lead time standard deviation in days")
+    min_order_quantity: int = Field(1, ge=0, description="Minimum order quantity")
+    case_pack_size: int = Field(1, ge=1, description="Case pack size")
+    budget_cap: Optional[float] = Field(None, gt=0, description="Maximum spend per order line")
+
+
+class InventoryLine(RequestSchema):
+    product_id: str = Field(..., description="Product ID")
+    store_id: Optional[str] = Field(None, description="Store ID")
+    current_inventory: int = Field(..., description="Current inventory level")
+    unit_cost: float = Field(0.0, ge=0, description="Unit cost")
+
+
+class ReorderRecommendationRequest(RequestSchema):
+    inventory_items: List[InventoryLine] = Field(..., min_length=1, description="Inventory lines to evaluate")
+    config: ReorderConfigRequest = Field(default_factory=ReorderConfigRequest)
+
+
+class ReorderPointRequest(RequestSchema):
+    product_id: str = Field(..., description="Product ID")
+    store_id: Optional[str] = Field(None, description="Store ID")
+    current_inventory: int = Field(0, description="Current inventory level")
+    unit_cost: float = Field(0.0, ge=0, description="Unit cost")
+    config: ReorderConfigRequest = Field(default_factory=ReorderConfigRequest)
@@ -0,0 +1,34 @@
+"""
+Shared test setup: import the backend packages from this checkout and point
+the settings at an in-memory SQLite database instead of PostgreSQL.
+"""
+
+import os
+import sys
+
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+
+@pytest_asyncio.fixture
+async def tables():
+    """Create every table on the in-memory engine for one test."""
+    from models.database import Base, engine
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture
+async def db_session(tables):
+    """Session on the in-memory engine; the caller commits what it needs."""
+    from models.database import AsyncSessionLocal
+    
+    async with AsyncSessionLocal() as session:
+        yield session
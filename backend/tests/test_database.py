@@ -0,0 +1,83 @@
+"""
+Tests for engine construction and bulk helpers in models.database.
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from models.database import Forecast, _create_engine, bulk_upsert_forecasts, get_ro_db
+
+
+@pytest.mark.asyncio
+async def test_sqlite_file_engine_uses_queue_pool_and_pragmas(tmp_path):
+    engine = _create_engine(f"sqlite+aiosqlite:///{tmp_path / 'inventory.db'}")
+    try:
+        assert isinstance(engine.pool, AsyncAdaptedQueuePool)
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+            assert (await conn.execute(text("PRAGMA temp_store"))).scalar() == 2  # MEMORY
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_memory_engine_keeps_static_pool():
+    engine = _create_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        assert isinstance(engine.pool, StaticPool)
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_forecasts_replaces_same_store_product_date(db_session):
+    store_id, product_id = uuid.uuid4().hex, uuid.uuid4().hex
+    
+    def rows(quantity):
+        return [{
+            "store_id": store_id,
+            "product_id": product_id,
+            "forecast_date": datetime(2024, 1, 15),
+            "forecast_horizon_days": 1,
+            "forecasted_quantity": quantity,
+            "model_version": "test"
+        }]
+    
+    await bulk_upsert_forecasts(db_session, rows(10.0))
+    await bulk_upsert_forecasts(db_session, rows(25.0))
+    await db_session.commit()
+    
+    result = await db_session.execute(select(Forecast.forecasted_quantity))
+    assert result.scalars().all() == [25.0]
+
+
+@pytest.mark.asyncio
+async def test_get_ro_db_rejects_writes_and_releases_the_connection(db_session):
+    row = {
+        "store_id": uuid.uuid4().hex,
+        "product_id": uuid.uuid4().hex,
+        "forecast_date": datetime(2024, 1, 15),
+        "forecast_horizon_days": 1,
+        "forecasted_quantity": 10.0,
+        "model_version": "test"
+    }
+    
+    dependency = get_ro_db()
+    ro_session = await anext(dependency)
+    with pytest.raises(OperationalError, match="readonly"):
+        await bulk_upsert_forecasts(ro_session, [row])
+    await dependency.aclose()
+    
+    # The in-memory engine shares its one connection, so writes work again
+    await bulk_upsert_forecasts(db_session, [row])
+    await db_session.commit()
+    result = await db_session.execute(select(Forecast.forecasted_quantity))
+    assert result.scalars().all() == [10.0]
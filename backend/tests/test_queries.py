@@ -0,0 +1,77 @@
+"""
+Tests for the Core-level queries in models.queries.
+"""
+
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import insert
+
+from models.database import Inventory, PurchaseOrderItem
+from models.queries import inventory_availability, purchase_order_item_totals
+
+
+def _id() -> str:
+    return uuid.uuid4().hex
+
+
+@pytest.mark.asyncio
+async def test_purchase_order_item_totals_multiplies_each_line(db_session):
+    po_id, other_po_id = _id(), _id()
+    db_session.add_all([
+        PurchaseOrderItem(purchase_order_id=po_id, product_id=_id(), quantity_ordered=3, unit_cost=2.5),
+        PurchaseOrderItem(purchase_order_id=po_id, product_id=_id(), quantity_ordered=10, unit_cost=4.0),
+        PurchaseOrderItem(purchase_order_id=other_po_id, product_id=_id(), quantity_ordered=1, unit_cost=99.0),
+    ])
+    # Written outside the ORM with a stale stored total; the query must not trust it
+    stale_id = _id()
+    await db_session.execute(insert(PurchaseOrderItem), [{
+        "id": stale_id, "purchase_order_id": po_id, "product_id": _id(),
+        "quantity_ordered": 2, "unit_cost": 5.0, "total_cost": 0.0
+    }])
+    await db_session.commit()
+    
+    totals = await purchase_order_item_totals(db_session, po_id)
+    
+    assert len(totals['id']) == 3
+    assert sorted(totals['total_cost'].tolist()) == [7.5, 10.0, 40.0]
+    assert totals['total_cost'][totals['id'].tolist().index(stale_id)] == 10.0
+    assert totals['total_amount'] == pytest.approx(57.5)
+
+
+@pytest.mark.asyncio
+async def test_purchase_order_item_totals_for_empty_order(db_session):
+    totals = await purchase_order_item_totals(db_session, _id())
+    
+    assert len(totals['id']) == 0
+    assert len(totals['total_cost']) == 0
+    assert totals['total_amount'] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_inventory_availability_subtracts_committed(db_session):
+    store_id, other_store_id = _id(), _id()
+    product_ids = [_id(), _id()]
+    db_session.add_all([
+        Inventory(store_id=store_id, product_id=product_ids[0], quantity_on_hand=50, quantity_committed=20),
+        Inventory(store_id=store_id, product_id=product_ids[1], quantity_on_hand=8, quantity_committed=0),
+        Inventory(store_id=other_store_id, product_id=product_ids[0], quantity_on_hand=5, quantity_committed=1),
+    ])
+    await db_session.commit()
+    
+    result = await inventory_availability(db_session, store_id)
+    
+    available = dict(zip(result['product_id'].tolist(), result['quantity_available'].tolist()))
+    assert available == {product_ids[0]: 30, product_ids[1]: 8}
+    assert result['quantity_available'].dtype == np.int32
+    
+    assert len((await inventory_availability(db_session))['id']) == 3
+
+
+@pytest.mark.asyncio
+async def test_inventory_availability_for_empty_store(db_session):
+    result = await inventory_availability(db_session, _id())
+    
+    assert len(result['id']) == 0
+    assert len(result['quantity_available']) == 0
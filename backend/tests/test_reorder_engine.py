@@ -0,0 +1,68 @@
+"""
+Parity tests: the array-based batch path must match the scalar
+generate_reorder_recommendation item for item.
+"""
+
+import dataclasses
+
+import numpy as np
+import pytest
+
+from core.optimization.reorder_engine import ReorderPointConfig, ReorderPointEngine
+
+PRODUCT_IDS = [f"prod_{i:03d}" for i in range(6)]
+STORE_IDS = ["store_001"] * len(PRODUCT_IDS)
+CURRENT_INVENTORY = np.array([0, 5, 40, 80, 150, 500], dtype=np.float64)
+# Includes a zero unit cost, which the budget cap must leave uncapped
+UNIT_COST = np.array([2.5, 0.0, 10.0, 1.0, 4.75, 3.0])
+DAILY_FORECASTS = np.random.default_rng(42).integers(0, 30, size=(len(PRODUCT_IDS), 30)).astype(np.float64)
+
+
+@pytest.mark.parametrize("config", [
+    ReorderPointConfig(),
+    ReorderPointConfig(case_pack_size=12, min_order_quantity=24),
+    ReorderPointConfig(budget_cap=100.0),
+    ReorderPointConfig(budget_cap=250.0, case_pack_size=6, service_level=0.99),
+    ReorderPointConfig(lead_time_days=14, lead_time_std_days=3.0, review_period_days=7),
+], ids=["default", "case_pack", "budget_cap", "budget_cap_case_pack", "long_lead_time"])
+def test_batch_matches_scalar(config):
+    engine = ReorderPointEngine()
+    
+    batch = engine.batch_reorder_recommendations_np(
+        PRODUCT_IDS, STORE_IDS, CURRENT_INVENTORY, UNIT_COST, DAILY_FORECASTS, config
+    )
+    assert len(batch) == len(PRODUCT_IDS)
+    
+    for rec in batch:
+        i = PRODUCT_IDS.index(rec.product_id)
+        expected = engine.generate_reorder_recommendation(
+            product_id=PRODUCT_IDS[i],
+            store_id=STORE_IDS[i],
+            current_inventory=int(CURRENT_INVENTORY[i]),
+            daily_forecasts=DAILY_FORECASTS[i].tolist(),
+            unit_cost=float(UNIT_COST[i]),
+            config=config
+        )
+        
+        actual = dataclasses.asdict(rec)
+        expected = dataclasses.asdict(expected)
+        assert actual.pop('total_cost') == pytest.approx(expected.pop('total_cost'))
+        del actual['recommendation_date'], expected['recommendation_date']
+        assert actual == expected
+
+
+def test_batch_records_match_recommendations():
+    engine = ReorderPointEngine()
+    config = ReorderPointConfig(budget_cap=100.0, case_pack_size=12)
+    
+    records = engine.batch_reorder_records(
+        PRODUCT_IDS, STORE_IDS, CURRENT_INVENTORY, UNIT_COST, DAILY_FORECASTS, config
+    )
+    recommendations = engine.batch_reorder_recommendations_np(
+        PRODUCT_IDS, STORE_IDS, CURRENT_INVENTORY, UNIT_COST, DAILY_FORECASTS, config
+    )
+    
+    assert [record['product_id'] for record in records] == [rec.product_id for rec in recommendations]
+    urgency_order = ['critical', 'high', 'medium', 'low']
+    urgencies = [urgency_order.index(record['urgency']) for record in records]
+    assert urgencies == sorted(urgencies)
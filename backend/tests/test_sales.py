@@ -0,0 +1,64 @@
+"""
+Tests for the bulk sales ingest endpoint.
+"""
+
+import uuid
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from api.endpoints import sales
+
+app = FastAPI()
+app.include_router(sales.router, prefix="/api/v1/sales")
+
+
+def _transaction(**overrides):
+    return {
+        "store_id": str(uuid.uuid4()),
+        "product_id": str(uuid.uuid4()),
+        "transaction_date": "2024-01-15T10:00:00",
+        "quantity_sold": 2,
+        "unit_price": 9.99,
+        "total_amount": 19.98,
+        **overrides
+    }
+
+
+@pytest_asyncio.fixture
+async def client(tables):
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_inserts_valid_batch(client):
+    response = await client.post("/api/v1/sales/bulk", json=[_transaction(), _transaction()])
+    
+    assert response.status_code == 201
+    assert response.json() == {"status": "success", "inserted": 2}
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_rejects_malformed_id(client):
+    response = await client.post("/api/v1/sales/bulk", json=[_transaction(store_id="store_001")])
+    
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == [0, "store_id"]
+    assert "INSERT" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_list_returns_ingested_transactions(client):
+    store_id = uuid.uuid4()
+    await client.post("/api/v1/sales/bulk", json=[_transaction(store_id=str(store_id))])
+    
+    response = await client.get("/api/v1/sales/", params={"store_id": str(store_id)})
+    
+    assert response.status_code == 200
+    transactions = response.json()
+    assert len(transactions) == 1
+    assert transactions[0]["store_id"] == store_id.hex
+    assert transactions[0]["quantity_sold"] == 2
@@ -0,0 +1,79 @@
+"""
+Tests for what-if scenario expansion against naive per-cell loops.
+"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core.optimization.scenarios import apply_scenario, scenario_forecast_rows
+
+START = date(2024, 1, 1)
+N_STORES, N_PRODUCTS, N_DAYS = 2, 3, 10
+FORECAST_DATES = np.arange(np.datetime64(START, "D"), np.datetime64(START + timedelta(days=N_DAYS), "D"))
+BASE_DEMAND = np.random.default_rng(7).uniform(0, 50, size=(N_STORES, N_PRODUCTS, N_DAYS))
+
+
+def _naive_scenario(demand_multiplier, promo_start_date, promo_end_date, promo_uplift_percent):
+    expected = np.empty_like(BASE_DEMAND)
+    for s in range(N_STORES):
+        for p in range(N_PRODUCTS):
+            for d in range(N_DAYS):
+                day = START + timedelta(days=d)
+                factor = demand_multiplier
+                if (promo_uplift_percent and promo_start_date is not None and promo_end_date is not None
+                        and promo_start_date <= day <= promo_end_date):
+                    factor *= 1 + promo_uplift_percent / 100
+                expected[s, p, d] = BASE_DEMAND[s, p, d] * factor
+    return expected
+
+
+@pytest.mark.parametrize("demand_multiplier, promo_start_date, promo_end_date, promo_uplift_percent", [
+    (1.0, None, None, 0.0),
+    (1.5, None, None, 0.0),
+    (1.2, date(2024, 1, 3), date(2024, 1, 5), 25.0),
+    # Promotion covering the first and last forecast days exactly
+    (1.0, date(2024, 1, 1), date(2024, 1, 10), 10.0),
+    # Single-day promotion on the last day
+    (0.8, date(2024, 1, 10), date(2024, 1, 10), 50.0),
+    # Promotion entirely outside the horizon
+    (1.0, date(2024, 2, 1), date(2024, 2, 5), 30.0),
+    # An open-ended promotion applies no uplift
+    (1.0, date(2024, 1, 3), None, 30.0),
+], ids=["baseline", "multiplier", "mid_promo", "full_promo", "last_day_promo", "outside_promo", "open_promo"])
+def test_apply_scenario_matches_naive_loop(demand_multiplier, promo_start_date, promo_end_date, promo_uplift_percent):
+    actual = apply_scenario(
+        BASE_DEMAND, FORECAST_DATES, demand_multiplier,
+        promo_start_date, promo_end_date, promo_uplift_percent
+    )
+    
+    assert actual.shape == BASE_DEMAND.shape
+    assert actual.dtype == np.float32
+    np.testing.assert_allclose(
+        actual, _naive_scenario(demand_multiplier, promo_start_date, promo_end_date, promo_uplift_percent),
+        rtol=1e-6
+    )
+
+
+def test_scenario_forecast_rows_matches_naive_loop():
+    store_ids = [f"store_{s}" for s in range(N_STORES)]
+    product_ids = [f"prod_{p}" for p in range(N_PRODUCTS)]
+    demand = apply_scenario(BASE_DEMAND, FORECAST_DATES, 1.1)
+    
+    rows = scenario_forecast_rows(store_ids, product_ids, FORECAST_DATES, demand, model_version="scenario")
+    
+    expected = [
+        {
+            'store_id': store_ids[s],
+            'product_id': product_ids[p],
+            'forecast_date': datetime.combine(START + timedelta(days=d), datetime.min.time()),
+            'forecast_horizon_days': d + 1,
+            'forecasted_quantity': pytest.approx(float(demand[s, p, d])),
+            'model_version': "scenario"
+        }
+        for s in range(N_STORES)
+        for p in range(N_PRODUCTS)
+        for d in range(N_DAYS)
+    ]
+    assert rows == expected